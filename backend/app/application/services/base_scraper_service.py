@@ -0,0 +1,441 @@
+"""
+Base Scraper Service - Infraestrutura comum dos scrapers de editais
+"""
+import httpx
+from typing import Dict, Optional
+from datetime import datetime, date
+import fitz  # PyMuPDF
+import pdfplumber
+import pytesseract
+from PIL import Image
+from io import BytesIO
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import re
+
+from ...domain.repositories.pdf_cache_repository import PdfCacheRepository
+
+
+# Data DD/MM/YYYY ou DD.MM.YYYY já capturada pelos padrões dos scrapers
+_DATE_PARTS_RE = re.compile(r'(\d{1,2})[/.](\d{1,2})[/.](\d{4})')
+
+# Páginas HTML respondem rápido; PDFs grandes de agências podem demorar bastante
+_PAGE_TIMEOUT = httpx.Timeout(30.0)
+_PDF_TIMEOUT = httpx.Timeout(120.0, connect=30.0)
+
+# Falhas de conexão (DNS/TCP/TLS) são repetidas pelo próprio transporte httpx
+_CONNECT_RETRIES = 3
+# Respostas de gateway/sobrecarga que valem nova tentativa no download de PDFs
+_RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+# Downloads de PDF são lidos em streaming e abortados acima do limite (evita estourar memória)
+_MAX_PDF_BYTES = 50 * 1024 * 1024
+# Pedaços de 128 KiB: menos iterações/extends por PDF sem pesar na memória
+_DOWNLOAD_CHUNK_BYTES = 128 * 1024
+
+# Textos acima disso não vão para o cache de PDFs (documento do MongoDB tem teto de 16 MB)
+_PDF_CACHE_MAX_TEXT_CHARS = 3_000_000
+
+# OCR de páginas escaneadas: resolução da renderização e idiomas do Tesseract
+_OCR_DPI = 200
+_OCR_LANG = "por"
+
+# Mínimo de páginas por tarefa no pool de processos: PDFs maiores são divididos entre os workers
+_PAGES_PER_TASK = 10
+
+
+def _ocr_page(page: "fitz.Page") -> str:
+    """
+    Faz OCR de uma única página (PDF escaneado, sem camada de texto).
+
+    Renderiza só esta página, então o pico de memória é de uma imagem por worker,
+    não do documento inteiro.
+
+    Args:
+        page: Página aberta pelo PyMuPDF
+
+    Returns:
+        str: Texto reconhecido ou string vazia se a página não tiver imagens ou o OCR falhar
+    """
+    if not page.get_images(full=False):
+        return ''
+
+    try:
+        pix = page.get_pixmap(dpi=_OCR_DPI, alpha=False)
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        return pytesseract.image_to_string(image, lang=_OCR_LANG)
+    except Exception as e:
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ OCR falhou na página {page.number + 1}: {e}")
+        return ''
+
+
+def _count_pages(pdf_content: bytes) -> int:
+    """
+    Conta as páginas do PDF (PyMuPDF lê só a tabela de xref; pdfplumber como fallback).
+
+    Args:
+        pdf_content: Conteúdo binário do PDF
+
+    Returns:
+        int: Total de páginas
+    """
+    try:
+        with fitz.open(stream=pdf_content, filetype="pdf") as doc:
+            return doc.page_count
+    except Exception:
+        with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+            return len(pdf.pages)
+
+
+def _extract_pages_pymupdf(pdf_content: bytes, first_page: int, last_page: Optional[int]) -> str:
+    """
+    Extrai texto de uma faixa de páginas com PyMuPDF (parser em C, bem mais rápido que pdfminer).
+    Páginas sem camada de texto passam por OCR individualmente.
+
+    Args:
+        pdf_content: Conteúdo binário do PDF
+        first_page: Índice (0-based) da primeira página da faixa
+        last_page: Índice final exclusivo da faixa (None = até o fim)
+
+    Returns:
+        str: Texto extraído da faixa
+    """
+    partes = []
+
+    with fitz.open(stream=pdf_content, filetype="pdf") as doc:
+        fim = doc.page_count if last_page is None else min(last_page, doc.page_count)
+
+        for pagina in doc.pages(first_page, fim):
+            texto_pagina = pagina.get_text("text")
+            if not texto_pagina.strip():
+                texto_pagina = _ocr_page(pagina)
+            if texto_pagina.strip():
+                partes.append(f"\n--- Página {pagina.number + 1} ---\n{texto_pagina}\n")
+
+    return ''.join(partes)
+
+
+def _extract_pages_pdfplumber(pdf_content: bytes, first_page: int, last_page: Optional[int]) -> str:
+    """
+    Extrai texto de uma faixa de páginas com pdfplumber (fallback para PDFs que o PyMuPDF rejeita).
+
+    Args:
+        pdf_content: Conteúdo binário do PDF
+        first_page: Índice (0-based) da primeira página da faixa
+        last_page: Índice final exclusivo da faixa (None = até o fim)
+
+    Returns:
+        str: Texto extraído da faixa
+    """
+    pdf_bytes = BytesIO(pdf_content)
+    partes = []
+
+    with pdfplumber.open(pdf_bytes) as pdf:
+        for pagina_num, pagina in enumerate(pdf.pages[first_page:last_page], first_page + 1):
+            # Página sem caracteres (em branco/escaneada): pula o extract_text
+            if not pagina.chars:
+                continue
+            texto_pagina = pagina.extract_text()
+            if texto_pagina:
+                partes.append(f"\n--- Página {pagina_num} ---\n{texto_pagina}\n")
+
+    return ''.join(partes)
+
+
+def _extract_pdf_pages_sync(pdf_content: bytes, first_page: int, last_page: Optional[int]) -> str:
+    """
+    Função auxiliar síncrona para extrair texto de uma faixa de páginas (executada em ProcessPool).
+    Usa PyMuPDF e recorre ao pdfplumber se o PDF não puder ser lido por ele.
+
+    Args:
+        pdf_content: Conteúdo binário do PDF
+        first_page: Índice (0-based) da primeira página da faixa
+        last_page: Índice final exclusivo da faixa (None = até o fim)
+
+    Returns:
+        str: Texto extraído da faixa
+    """
+    try:
+        return _extract_pages_pymupdf(pdf_content, first_page, last_page)
+    except Exception as e:
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ PyMuPDF falhou ({e}), usando pdfplumber")
+        return _extract_pages_pdfplumber(pdf_content, first_page, last_page)
+
+
+class BaseScraperService:
+    """
+    Base dos serviços de raspagem.
+    Mantém um cliente HTTP persistente (keep-alive/pool de conexões entre páginas e PDFs
+    do mesmo site) e o pool de processos usado na extração de texto dos PDFs.
+    """
+
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        max_workers: int = 2,
+        pdf_cache_repository: Optional[PdfCacheRepository] = None
+    ):
+        """
+        Inicializa a infraestrutura comum.
+
+        Args:
+            headers: Headers HTTP enviados em todas as requisições do scraper
+            max_workers: Número de processos para extração de PDFs
+            pdf_cache_repository: Cache persistente de validadores HTTP e texto dos PDFs
+                (opcional; sem ele não há GET condicional)
+        """
+        self.headers = headers
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._client: Optional[httpx.AsyncClient] = None
+        # Em 304 o texto salvo é reaproveitado sem novo download
+        self.pdf_cache_repo = pdf_cache_repository
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP do scraper, criado no primeiro uso e reaproveitado entre jobs."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=_PAGE_TIMEOUT,
+                follow_redirects=True,
+                # Com transporte explícito, os limites do pool ficam no transporte
+                transport=httpx.AsyncHTTPTransport(
+                    retries=_CONNECT_RETRIES,
+                    limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+                )
+            )
+        return self._client
+
+    def _parse_date(self, date_str: str) -> Optional[date]:
+        """
+        Converte string de data DD/MM/YYYY ou DD.MM.YYYY para objeto date.
+
+        Monta a data direto dos grupos numéricos (sem strptime, que reinterpreta o
+        formato a cada chamada).
+
+        Args:
+            date_str: String da data (ex: "31/12/2025" ou "31.12.2025")
+
+        Returns:
+            Optional[date]: Objeto date ou None se falhar
+        """
+        match = _DATE_PARTS_RE.fullmatch(date_str.strip())
+        if not match:
+            return None
+
+        dia, mes, ano = match.groups()
+        try:
+            return date(int(ano), int(mes), int(dia))
+        except ValueError:
+            return None
+
+    def _is_pdf(self, url: str, content_type: str, content: bytes) -> bool:
+        """
+        Indica se a resposta baixada é um PDF. Scrapers sobrescrevem conforme o site.
+
+        Args:
+            url: URL do download
+            content_type: Header Content-Type da resposta
+            content: Corpo da resposta
+
+        Returns:
+            bool: True se deve ser processado como PDF
+        """
+        return 'application/pdf' in content_type or url.lower().endswith('.pdf')
+
+    async def download_and_extract_pdf(self, url: str, max_retries: int = 3) -> Optional[str]:
+        """
+        Baixa um PDF e extrai o texto com retry automático.
+
+        Args:
+            url: URL do PDF
+            max_retries: Número máximo de tentativas
+
+        Returns:
+            Optional[str]: Texto extraído ou None se falhar
+        """
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Baixando PDF: {url}")
+
+        cached = await self._find_cached_pdf(url)
+        conditional_headers = {}
+        if cached:
+            if cached.get('etag'):
+                conditional_headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                conditional_headers['If-Modified-Since'] = cached['last_modified']
+
+        for attempt in range(max_retries):
+            try:
+                async with self.client.stream('GET', url, headers=conditional_headers, timeout=_PDF_TIMEOUT) as response:
+                    if response.status_code == 304 and cached:
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ♻️ PDF não modificado, reaproveitando texto extraído: {len(cached['texto'])} caracteres")
+                        return cached['texto']
+
+                    response.raise_for_status()
+                    content = await self._read_pdf_body(url, response)
+
+                if content is None:
+                    return None
+
+                # Extrair texto do PDF em processo separado (não bloqueia a API)
+                texto_completo = await self._extract_pdf_text(content)
+
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Texto extraído: {len(texto_completo)} caracteres")
+                await self._remember_pdf(url, response.headers, texto_completo)
+                return texto_completo
+
+            except (httpx.ReadTimeout, httpx.ConnectTimeout) as e:
+                if attempt < max_retries - 1:
+                    wait_time = (attempt + 1) * 2  # Backoff exponencial: 2s, 4s, 6s
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ Timeout (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Timeout após {max_retries} tentativas: {e}")
+                    return None
+
+            except httpx.RemoteProtocolError as e:
+                if attempt < max_retries - 1:
+                    wait_time = (attempt + 1) * 3  # Backoff maior para erros de protocolo
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ Servidor desconectou (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Servidor desconectou após {max_retries} tentativas: {e}")
+                    return None
+
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                if status_code in _RETRY_STATUS_CODES and attempt < max_retries - 1:
+                    wait_time = (attempt + 1) * 2
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ HTTP {status_code} (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao baixar/processar PDF: {e}")
+                    return None
+
+            except Exception as e:
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao baixar/processar PDF: {e}")
+                return None
+
+        return None
+
+    async def _read_pdf_body(self, url: str, response: httpx.Response) -> Optional[bytearray]:
+        """
+        Lê o corpo do PDF em streaming, descartando cedo o que não serve.
+
+        O tamanho é checado pelo Content-Length antes de qualquer leitura e o tipo
+        (_is_pdf) já no primeiro bloco recebido; páginas HTML e arquivos grandes
+        demais são abandonados sem baixar o resto do corpo.
+
+        Args:
+            url: URL do download
+            response: Resposta aberta com client.stream()
+
+        Returns:
+            Optional[bytearray]: Corpo da resposta ou None se não for PDF ou exceder o limite
+        """
+        content_type = response.headers.get('Content-Type', '')
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > _MAX_PDF_BYTES:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ PDF maior que {_MAX_PDF_BYTES // (1024 * 1024)} MB, ignorado: {url}")
+            return None
+
+        buffer = bytearray()
+        async for part in response.aiter_bytes(_DOWNLOAD_CHUNK_BYTES):
+            if not buffer and not self._is_pdf(url, content_type, part):
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Não é um PDF: {content_type}")
+                return None
+
+            buffer.extend(part)
+            if len(buffer) > _MAX_PDF_BYTES:
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ PDF maior que {_MAX_PDF_BYTES // (1024 * 1024)} MB, ignorado: {url}")
+                return None
+
+        if not buffer:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Resposta vazia: {url}")
+            return None
+
+        # O próprio buffer segue para a extração (PyMuPDF/pdfplumber aceitam bytearray), sem cópia extra
+        return buffer
+
+    async def _extract_pdf_text(self, pdf_content: bytes) -> str:
+        """
+        Extrai o texto do PDF no pool de processos, em faixas de páginas paralelas.
+
+        O total de páginas é contado antes (também no pool: PyMuPDF não é thread-safe e
+        nunca roda em threads do processo da API), então todas as faixas (uma por worker,
+        com no mínimo _PAGES_PER_TASK páginas) são despachadas de uma vez e o texto
+        é reunido na ordem original.
+
+        Args:
+            pdf_content: Conteúdo binário do PDF
+
+        Returns:
+            str: Texto extraído
+        """
+        loop = asyncio.get_running_loop()
+        total_paginas = await loop.run_in_executor(self.executor, _count_pages, pdf_content)
+        paginas_por_tarefa = max(_PAGES_PER_TASK, -(-total_paginas // self.max_workers))
+
+        faixas = await asyncio.gather(*(
+            loop.run_in_executor(
+                self.executor,
+                _extract_pdf_pages_sync,
+                pdf_content,
+                inicio,
+                inicio + paginas_por_tarefa
+            )
+            for inicio in range(0, max(total_paginas, 1), paginas_por_tarefa)
+        ))
+
+        return ''.join(faixas)
+
+    async def _find_cached_pdf(self, url: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Busca validadores HTTP e texto salvos de um download anterior do PDF.
+
+        Args:
+            url: URL do PDF
+
+        Returns:
+            Optional[Dict]: {'etag', 'last_modified', 'texto'} ou None (sem cache ou falha)
+        """
+        if self.pdf_cache_repo is None:
+            return None
+
+        try:
+            return await self.pdf_cache_repo.find_by_url(url)
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Falha ao ler cache de PDFs (download completo): {e}")
+            return None
+
+    async def _remember_pdf(self, url: str, headers: httpx.Headers, texto: str):
+        """
+        Persiste validadores HTTP e texto extraído para o próximo GET condicional.
+
+        Args:
+            url: URL do PDF
+            headers: Headers da resposta
+            texto: Texto extraído do PDF
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if self.pdf_cache_repo is None or not texto or not (etag or last_modified):
+            return
+        if len(texto) > _PDF_CACHE_MAX_TEXT_CHARS:
+            return
+
+        try:
+            await self.pdf_cache_repo.save(url, etag, last_modified, texto)
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Falha ao salvar cache de PDFs: {e}")
+
+    async def aclose(self):
+        """Fecha o cliente HTTP persistente"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def shutdown(self):
+        """Encerra o executor de processos"""
+        self.executor.shutdown(wait=True)
@@ -1,57 +1,38 @@
 """
 CAPES Scraper Service - Serviço de raspagem da CAPES
 """
-import httpx
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
-import pdfplumber
-from io import BytesIO
-import asyncio
-from concurrent.futures import ProcessPoolExecutor
 import re
 
+from ...domain.repositories.pdf_cache_repository import PdfCacheRepository
+from .base_scraper_service import BaseScraperService
 
-def _extract_pdf_text_sync(pdf_content: bytes) -> str:
-    """
-    Função auxiliar síncrona para extrair texto de PDF (executada em ProcessPool).
-
-    Args:
-        pdf_content: Conteúdo binário do PDF
-
-    Returns:
-        str: Texto extraído
-    """
-    pdf_bytes = BytesIO(pdf_content)
-    texto_completo = ''
 
-    with pdfplumber.open(pdf_bytes) as pdf:
-        total_paginas = len(pdf.pages)
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+_SECTION_TITLE_RE = re.compile(r'Chamadas públicas \d{4}', re.IGNORECASE)
 
-        for pagina_num, pagina in enumerate(pdf.pages, 1):
-            texto_pagina = pagina.extract_text()
-            if texto_pagina:
-                texto_completo += f"\n--- Página {pagina_num} ---\n{texto_pagina}\n"
 
-    return texto_completo
-
-
-class CapesScraperService:
+class CapesScraperService(BaseScraperService):
     """
     Serviço para raspagem de chamadas públicas da CAPES.
     """
 
-    def __init__(self, max_workers: int = 2):
+    def __init__(self, max_workers: int = 2, pdf_cache_repository: Optional[PdfCacheRepository] = None):
         self.base_url = "https://www.gov.br/capes/pt-br/acesso-a-informacao/licitacoes-e-contratos/chamadas-publicas/chamadas"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        super().__init__(
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+                'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Connection': 'keep-alive',
+                'Upgrade-Insecure-Requests': '1',
+            },
+            max_workers=max_workers,
+            pdf_cache_repository=pdf_cache_repository
+        )
 
     def _extract_year_from_text(self, text: str) -> Optional[int]:
         """
@@ -64,7 +45,7 @@ class CapesScraperService:
             Optional[int]: Ano encontrado ou None
         """
         # Buscar padrões de ano (2024, 2025, etc.)
-        match = re.search(r'\b(20\d{2})\b', text)
+        match = _YEAR_RE.search(text)
         if match:
             return int(match.group(1))
         return None
@@ -87,18 +68,17 @@ class CapesScraperService:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Iniciando raspagem da CAPES...")
 
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(self.base_url, headers=self.headers)
-                response.raise_for_status()
+            response = await self.client.get(self.base_url)
+            response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml')
 
             chamadas = []
             current_year = date.today().year
             processed_sections = set()  # Evitar duplicatas
 
             # Buscar todas as seções de chamadas (geralmente h3 com "Chamadas públicas XXXX")
-            sections = soup.find_all(['h3', 'h2'], string=re.compile(r'Chamadas públicas \d{4}', re.IGNORECASE))
+            sections = soup.find_all(['h3', 'h2'], string=_SECTION_TITLE_RE)
 
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Encontradas {len(sections)} seções de chamadas")
 
@@ -138,6 +118,7 @@ class CapesScraperService:
 
                     # Buscar todos os links que contêm "-pdf" no href dentro desta seção
                     pdf_links = []
+                    seen_urls = set()  # Mesmo PDF linkado mais de uma vez na seção
                     all_links = content_container.find_all('a', href=True)
 
                     for link in all_links:
@@ -152,7 +133,10 @@ class CapesScraperService:
                                 pdf_url = f"https://www.gov.br{href}"
                             else:
                                 pdf_url = f"https://www.gov.br/capes/pt-br/acesso-a-informacao/licitacoes-e-contratos/chamadas-publicas/{href}"
-                            
+
+                            if pdf_url in seen_urls:
+                                continue
+                            seen_urls.add(pdf_url)
                             pdf_links.append(pdf_url)
                             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📎 PDF encontrado: {pdf_url}")
 
@@ -178,81 +162,8 @@ class CapesScraperService:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ ERRO na raspagem: {e}")
             raise
 
-    async def download_and_extract_pdf(self, url: str, max_retries: int = 3) -> Optional[str]:
-        """
-        Baixa um PDF e extrai o texto com retry automático.
-
-        Args:
-            url: URL do PDF
-            max_retries: Número máximo de tentativas
-
-        Returns:
-            Optional[str]: Texto extraído ou None se falhar
-        """
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Baixando PDF: {url}")
-
-        for attempt in range(max_retries):
-            try:
-                # Timeout mais alto e configurações de retry
-                timeout = httpx.Timeout(120.0, connect=30.0)
-
-                async with httpx.AsyncClient(
-                    timeout=timeout,
-                    follow_redirects=True,
-                    limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-                ) as client:
-                    response = await client.get(url, headers=self.headers)
-                    response.raise_for_status()
-
-                content_type = response.headers.get('Content-Type', '')
-
-                # CAPES: links com "-pdf" retornam PDFs mesmo sem Content-Type correto
-                # Validar se é PDF pelo conteúdo ou pela URL
-                is_pdf_url = '-pdf' in url.lower() or url.lower().endswith('.pdf')
-                is_pdf_content = 'application/pdf' in content_type
-                
-                # Verificar se o conteúdo começa com assinatura PDF (%PDF)
-                is_pdf_signature = response.content[:4] == b'%PDF'
-
-                if not (is_pdf_content or is_pdf_url or is_pdf_signature):
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Não é um PDF: {content_type}")
-                    return None
-
-                # Extrair texto do PDF em processo separado (não bloqueia a API)
-                loop = asyncio.get_event_loop()
-                texto_completo = await loop.run_in_executor(
-                    self.executor,
-                    _extract_pdf_text_sync,
-                    response.content
-                )
-
-                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Texto extraído: {len(texto_completo)} caracteres")
-                return texto_completo
-
-            except (httpx.ReadTimeout, httpx.ConnectTimeout) as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # Backoff exponencial: 2s, 4s, 6s
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ Timeout (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Timeout após {max_retries} tentativas: {e}")
-                    return None
-
-            except httpx.RemoteProtocolError as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 3  # Backoff maior para erros de protocolo
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ Servidor desconectou (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Servidor desconectou após {max_retries} tentativas: {e}")
-                    return None
-
-            except Exception as e:
-                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao baixar/processar PDF: {e}")
-                return None
-
-        return None
-
-    def shutdown(self):
-        """Encerra o executor de processos"""
-        self.executor.shutdown(wait=True)
+    def _is_pdf(self, url: str, content_type: str, content: bytes) -> bool:
+        """CAPES: links com "-pdf" retornam PDFs mesmo sem Content-Type correto"""
+        # Validar se é PDF pelo conteúdo, pela URL ou pela assinatura (%PDF)
+        is_pdf_url = '-pdf' in url.lower() or url.lower().endswith('.pdf')
+        return 'application/pdf' in content_type or is_pdf_url or content[:4] == b'%PDF'
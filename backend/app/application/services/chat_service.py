@@ -27,7 +27,8 @@ class ChatService:
         temperature: float = 0.3,
         top_k_chunks: int = 5,
         max_context_length: int = 4000,
-        distance_threshold: float = 1.5
+        distance_threshold: float = 1.5,
+        openai_client: Optional[AsyncOpenAI] = None
     ):
         """
         Inicializa o serviço de chat.
@@ -41,8 +42,9 @@ class ChatService:
             top_k_chunks: Quantos chunks buscar do ChromaDB
             max_context_length: Limite de tokens do contexto
             distance_threshold: Threshold de relevância (menor = mais restritivo)
+            openai_client: Cliente OpenAI compartilhado (opcional; evita um pool HTTP por requisição)
         """
-        self.client = AsyncOpenAI(api_key=openai_api_key)
+        self.client = openai_client or AsyncOpenAI(api_key=openai_api_key)
         self.chromadb = chromadb_service
         self.conversation_repo = conversation_repository
         self.model = model
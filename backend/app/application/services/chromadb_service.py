@@ -4,17 +4,43 @@ ChromaDB Service - Gerenciamento de vetorização e armazenamento
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Set, Tuple
 from datetime import datetime
+import asyncio
+import copy
+import hashlib
+import time
 import uuid
 
 
+# Chunks por chamada de add(): um único request de embeddings na OpenAI por lote,
+# bem abaixo do limite de inputs/tokens por requisição
+_ADD_BATCH_SIZE = 100
+
+# Leituras da coleção inteira são paginadas (evita uma única resposta gigante do servidor Chroma)
+_GET_PAGE_SIZE = 1000
+
+# Estatísticas da coleção reaproveitadas por este tempo (a contagem de editais varre os metadados)
+_STATS_TTL_SECONDS = 60
+
+
+def _content_hash(text: str) -> str:
+    """SHA-256 do texto do chunk (identifica trechos repetidos entre editais)."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
 class ChromaDBService:
     """
     Serviço para vetorização e armazenamento de chunks no ChromaDB.
     """
 
-    def __init__(self, chroma_host: str = "chroma", chroma_port: int = 8000, openai_api_key: str = None):
+    def __init__(
+        self,
+        chroma_host: str = "chroma",
+        chroma_port: int = 8000,
+        openai_api_key: str = None,
+        persist_dir: Optional[str] = None
+    ):
         """
         Inicializa conexão com ChromaDB.
 
@@ -22,17 +48,27 @@ class ChromaDBService:
             chroma_host: Host do ChromaDB
             chroma_port: Porta do ChromaDB
             openai_api_key: Chave da API OpenAI para embeddings
+            persist_dir: Diretório do Chroma embutido (opcional; evita HTTP/JSON em uso local)
         """
-        self.client = chromadb.HttpClient(
-            host=chroma_host,
-            port=chroma_port,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
+        client_settings = Settings(
+            anonymized_telemetry=False,
+            allow_reset=True
         )
+        if persist_dir:
+            self.client = chromadb.PersistentClient(path=persist_dir, settings=client_settings)
+        else:
+            self.client = chromadb.HttpClient(
+                host=chroma_host,
+                port=chroma_port,
+                settings=client_settings
+            )
         self.openai_api_key = openai_api_key
         self.collection_name = "editais_chunks"
+        # (momento do cálculo, estatísticas); zerado a cada escrita na coleção
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        # Incrementado a cada escrita: get_stats só guarda o cálculo se nenhuma escrita
+        # terminou enquanto ele rodava
+        self._write_generation = 0
         self._ensure_collection()
 
     def _ensure_collection(self):
@@ -52,6 +88,7 @@ class ChromaDBService:
                 api_key=self.openai_api_key,
                 model_name="text-embedding-3-small"
             )
+            self.embedding_function = openai_ef
 
             # ⚠️ SEMPRE RECRIAR COLLECTION PARA GARANTIR EMBEDDING CORRETO
             # Verificar se collection existe
@@ -140,42 +177,102 @@ class ChromaDBService:
         Returns:
             str: ID do documento no ChromaDB
         """
-        # Gerar ID único para o chunk
-        chunk_id = f"{edital_uuid}_chunk_{chunk_index}"
+        # Mesmo caminho do lote: metadados (inclusive content_sha256) montados num só lugar
+        chunk_ids = await self.add_chunks(
+            edital_uuid=edital_uuid,
+            chunk_texts=[chunk_text],
+            edital_names=[edital_name],
+            chunk_indexes=[chunk_index],
+            total_chunks=total_chunks,
+            metadatas=[metadata]
+        )
+        return chunk_ids[0]
+
+    async def add_chunks(
+        self,
+        edital_uuid: str,
+        chunk_texts: List[str],
+        edital_names: List[str],
+        chunk_indexes: List[int],
+        total_chunks: int,
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+        embeddings: Optional[List[List[float]]] = None
+    ) -> List[str]:
+        """
+        Adiciona vários chunks de um edital em lote (um request de embeddings por lote).
 
-        # Preparar metadados
-        chunk_metadata = {
+        Args:
+            edital_uuid: UUID do edital
+            chunk_texts: Textos dos chunks
+            edital_names: Nome/apelido do edital para cada chunk
+            chunk_indexes: Índice de cada chunk
+            total_chunks: Total de chunks do edital
+            metadatas: Metadados adicionais de cada chunk (opcional)
+            embeddings: Embeddings já calculados com embed_texts (opcional; senão a coleção vetoriza)
+
+        Returns:
+            List[str]: IDs dos documentos no ChromaDB
+        """
+        metadatas = metadatas or [None] * len(chunk_texts)
+        chunk_ids = [f"{edital_uuid}_chunk_{chunk_index}" for chunk_index in chunk_indexes]
+        # Campos constantes do edital (inclusive um único created_at para o lote todo)
+        base_metadata = {
             "edital_uuid": edital_uuid,
-            "edital_name": edital_name or "Sem nome",
-            "chunk_index": chunk_index,
             "total_chunks": total_chunks,
             "created_at": datetime.utcnow().isoformat(),
         }
-
-        # Adicionar metadados customizados
-        if metadata:
-            for key, value in metadata.items():
-                # ChromaDB aceita apenas strings, ints, floats e booleans
-                if isinstance(value, (str, int, float, bool)):
-                    chunk_metadata[key] = value
-                elif value is not None:
-                    chunk_metadata[key] = str(value)
+        chunk_metadatas = [
+            {
+                **base_metadata,
+                "edital_name": edital_name or "Sem nome",
+                "chunk_index": chunk_index,
+                "content_sha256": _content_hash(chunk_text),
+                **self._sanitize_metadata(metadata),
+            }
+            for chunk_text, edital_name, chunk_index, metadata in zip(chunk_texts, edital_names, chunk_indexes, metadatas)
+        ]
 
         try:
-            # Adicionar ao ChromaDB (vetorização automática)
-            self.collection.add(
-                documents=[chunk_text],
-                metadatas=[chunk_metadata],
-                ids=[chunk_id]
-            )
+            for start in range(0, len(chunk_ids), _ADD_BATCH_SIZE):
+                end = start + _ADD_BATCH_SIZE
+                # Adicionar ao ChromaDB (vetorização automática do lote inteiro, se não vierem prontos)
+                await asyncio.to_thread(
+                    self.collection.add,
+                    documents=chunk_texts[start:end],
+                    metadatas=chunk_metadatas[start:end],
+                    ids=chunk_ids[start:end],
+                    embeddings=embeddings[start:end] if embeddings else None
+                )
 
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔍 Chunk {chunk_index}/{total_chunks} vetorizado no ChromaDB: {edital_name}")
-            return chunk_id
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔍 {len(chunk_ids)} chunks vetorizados no ChromaDB: {edital_names[0] if edital_names else edital_uuid}")
+            self._invalidate_stats()
+            return chunk_ids
 
         except Exception as e:
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao vetorizar chunk {chunk_index}: {e}")
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao vetorizar chunks do edital {edital_uuid}: {e}")
             raise
 
+    @staticmethod
+    def _sanitize_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Converte metadados customizados para os tipos aceitos pelo ChromaDB.
+
+        Args:
+            metadata: Metadados adicionais (opcional)
+
+        Returns:
+            Dict[str, Any]: Metadados sem None e com valores escalares
+        """
+        if not metadata:
+            return {}
+
+        # ChromaDB aceita apenas strings, ints, floats e booleans
+        return {
+            key: value if isinstance(value, (str, int, float, bool)) else str(value)
+            for key, value in metadata.items()
+            if value is not None
+        }
+
     async def search_similar(
         self,
         query: str,
@@ -206,7 +303,8 @@ class ChromaDBService:
                 ef_type = type(self.collection._embedding_function).__name__
                 print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚙️ Embedding Function: {ef_type}")
 
-            results = self.collection.query(
+            results = await asyncio.to_thread(
+                self.collection.query,
                 query_texts=[query],
                 n_results=n_results,
                 where=where_filter
@@ -215,48 +313,184 @@ class ChromaDBService:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ ChromaDB retornou {len(results.get('ids', [[]])[0])} chunks")
 
             # Formatar resultados
-            formatted_results = []
             if results['documents'] and len(results['documents']) > 0:
-                for i in range(len(results['documents'][0])):
-                    chunk_id = results['ids'][0][i]
-                    distance = results['distances'][0][i] if results['distances'] else None
-                    metadata = results['metadatas'][0][i] if results['metadatas'] else {}
+                return self._format_query_results(results, 0)
+            return []
 
-                    # ⭐ LOG: Mostrar cada chunk retornado
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Chunk {i+1}: {chunk_id} | Distance: {distance:.4f} | Index: {metadata.get('chunk_index')}")
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro na busca vetorial: {e}")
+            return []
 
-                    formatted_results.append({
-                        "id": chunk_id,
-                        "text": results['documents'][0][i],
-                        "metadata": metadata,
-                        "distance": distance
-                    })
+    async def search_similar_batch(
+        self,
+        queries: List[str],
+        n_results: int = 10,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Busca chunks similares para várias consultas de uma vez.
 
-            return formatted_results
+        Os embeddings de todas as consultas saem de uma única chamada à OpenAI e a
+        busca vetorial é feita numa única query ao ChromaDB.
 
-        except Exception as e:
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro na busca vetorial: {e}")
+        Args:
+            queries: Textos das consultas
+            n_results: Número de resultados por consulta
+            filter_metadata: Filtros de metadados
+
+        Returns:
+            List[List[Dict]]: Uma lista de resultados por consulta, na mesma ordem
+        """
+        if not queries:
             return []
 
+        try:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔍 Iniciando busca vetorial em lote: {len(queries)} consultas, {n_results} resultados cada")
+
+            query_embeddings = await asyncio.to_thread(self.embedding_function, queries)
+            results = await asyncio.to_thread(
+                self.collection.query,
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                where=filter_metadata if filter_metadata else None
+            )
+
+            return [
+                self._format_query_results(results, q) if results['documents'] else []
+                for q in range(len(queries))
+            ]
+
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro na busca vetorial em lote: {e}")
+            return [[] for _ in queries]
+
+    @staticmethod
+    def _format_query_results(results: Dict[str, Any], q: int) -> List[Dict[str, Any]]:
+        """
+        Formata os resultados de uma das consultas de um collection.query.
+
+        Args:
+            results: Retorno de collection.query
+            q: Índice da consulta
+
+        Returns:
+            List[Dict]: Lista de resultados
+        """
+        formatted_results = []
+        for i in range(len(results['documents'][q])):
+            chunk_id = results['ids'][q][i]
+            distance = results['distances'][q][i] if results['distances'] else None
+            metadata = results['metadatas'][q][i] if results['metadatas'] else {}
+
+            # ⭐ LOG: Mostrar cada chunk retornado
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Chunk {i+1}: {chunk_id} | Distance: {distance:.4f} | Index: {metadata.get('chunk_index')}")
+
+            formatted_results.append({
+                "id": chunk_id,
+                "text": results['documents'][q][i],
+                "metadata": metadata,
+                "distance": distance
+            })
+
+        return formatted_results
+
+    def _iter_pages(self, include: List[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre a coleção inteira em páginas de _GET_PAGE_SIZE registros.
+
+        Args:
+            include: Campos a trazer do Chroma (ex: ["metadatas"]); ids vêm sempre
+
+        Returns:
+            Iterator[Dict[str, Any]]: Resultados de collection.get por página
+        """
+        offset = 0
+        while True:
+            page = self.collection.get(limit=_GET_PAGE_SIZE, offset=offset, include=include)
+            ids = page.get('ids') or []
+            if not ids:
+                return
+
+            yield page
+
+            if len(ids) < _GET_PAGE_SIZE:
+                return
+            offset += len(ids)
+
+    def _collect_pages(self, include: List[str]) -> Dict[str, List[Any]]:
+        """
+        Junta as páginas de _iter_pages em listas únicas à medida que chegam.
+
+        Cada página é descartada depois de copiada, sem manter a lista de páginas.
+
+        Args:
+            include: Campos a trazer além dos ids
+
+        Returns:
+            Dict[str, List]: "ids" e uma lista por campo de include
+        """
+        result: Dict[str, List[Any]] = {"ids": [], **{field: [] for field in include}}
+        for page in self._iter_pages(include=include):
+            result["ids"].extend(page['ids'])
+            for field in include:
+                result[field].extend(page.get(field) or [])
+        return result
+
     async def get_all_documents(self) -> Dict[str, Any]:
         """
-        Retorna todos os documentos da coleção.
+        Retorna todos os documentos da coleção (lidos em páginas).
 
         Returns:
             Dict: Documentos com metadados
         """
         try:
-            result = self.collection.get()
+            result = await asyncio.to_thread(self._collect_pages, ["documents", "metadatas"])
+            result["total"] = len(result["ids"])
+            return result
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao buscar documentos: {e}")
+            return {"ids": [], "documents": [], "metadatas": [], "total": 0}
+
+    async def get_documents_page(self, skip: int = 0, limit: int = _GET_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Retorna uma página de documentos da coleção.
+
+        Args:
+            skip: Número de documentos a pular
+            limit: Máximo de documentos na página
+
+        Returns:
+            Dict: Documentos com metadados da página e total da coleção
+        """
+        try:
+            result = await asyncio.to_thread(
+                self.collection.get, limit=limit, offset=skip, include=["documents", "metadatas"]
+            )
             return {
-                "ids": result.get('ids', []),
-                "documents": result.get('documents', []),
-                "metadatas": result.get('metadatas', []),
-                "total": len(result.get('ids', []))
+                "ids": result.get('ids') or [],
+                "documents": result.get('documents') or [],
+                "metadatas": result.get('metadatas') or [],
+                "total": await asyncio.to_thread(self.collection.count)
             }
         except Exception as e:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao buscar documentos: {e}")
             return {"ids": [], "documents": [], "metadatas": [], "total": 0}
 
+    async def get_all_metadatas(self) -> Dict[str, Any]:
+        """
+        Retorna ids e metadados de toda a coleção, sem o texto dos chunks.
+
+        Returns:
+            Dict: IDs e metadados
+        """
+        try:
+            result = await asyncio.to_thread(self._collect_pages, ["metadatas"])
+            result["total"] = len(result["ids"])
+            return result
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao buscar metadados: {e}")
+            return {"ids": [], "metadatas": [], "total": 0}
+
     async def delete_by_edital(self, edital_uuid: str) -> int:
         """
         Deleta todos os chunks de um edital.
@@ -268,14 +502,17 @@ class ChromaDBService:
             int: Número de chunks deletados
         """
         try:
-            # Buscar todos os chunks do edital
-            result = self.collection.get(
-                where={"edital_uuid": edital_uuid}
+            # Buscar os ids dos chunks do edital (sem texto nem metadados)
+            result = await asyncio.to_thread(
+                self.collection.get,
+                where={"edital_uuid": edital_uuid},
+                include=[]
             )
 
             ids_to_delete = result.get('ids', [])
             if ids_to_delete:
-                self.collection.delete(ids=ids_to_delete)
+                await asyncio.to_thread(self.collection.delete, ids=ids_to_delete)
+                self._invalidate_stats()
                 print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🗑️ {len(ids_to_delete)} chunks deletados do ChromaDB")
                 return len(ids_to_delete)
 
@@ -293,31 +530,55 @@ class ChromaDBService:
             bool: True se sucesso
         """
         try:
-            self.client.delete_collection(self.collection_name)
-            self._ensure_collection()  # Recriar coleção vazia
+            await asyncio.to_thread(self.client.delete_collection, self.collection_name)
+            await asyncio.to_thread(self._ensure_collection)  # Recriar coleção vazia
+            self._invalidate_stats()
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🗑️ Coleção ChromaDB limpa")
             return True
         except Exception as e:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao limpar coleção: {e}")
             return False
 
+    def _invalidate_stats(self):
+        """Descarta as estatísticas em cache após uma escrita na coleção."""
+        self._write_generation += 1
+        self._stats_cache = None
+
+    def _collect_edital_uuids(self) -> Set[str]:
+        """
+        Reúne os edital_uuid da coleção, uma página de metadados por vez.
+
+        Cada página é descartada assim que consumida; só o conjunto de UUIDs fica em memória.
+
+        Returns:
+            Set[str]: UUIDs dos editais com chunks na coleção
+        """
+        return {
+            metadata['edital_uuid']
+            for page in self._iter_pages(include=["metadatas"])
+            for metadata in page.get('metadatas') or []
+            if metadata and 'edital_uuid' in metadata
+        }
+
     async def get_stats(self) -> Dict[str, Any]:
         """
         Retorna estatísticas da coleção.
 
+        O resultado fica em cache por _STATS_TTL_SECONDS; qualquer escrita feita por
+        este serviço (add/delete/clear) invalida o cache.
+
         Returns:
             Dict: Estatísticas
         """
+        if self._stats_cache and time.monotonic() - self._stats_cache[0] < _STATS_TTL_SECONDS:
+            return copy.deepcopy(self._stats_cache[1])
+
+        generation = self._write_generation
         try:
-            result = self.collection.get()
-            total_docs = len(result.get('ids', []))
+            total_docs = await asyncio.to_thread(self.collection.count)
 
-            # Contar editais únicos
-            unique_editais = set()
-            if result.get('metadatas'):
-                for metadata in result['metadatas']:
-                    if 'edital_uuid' in metadata:
-                        unique_editais.add(metadata['edital_uuid'])
+            # Contar editais únicos (só metadados, página a página; sem texto nem embeddings)
+            unique_editais = await asyncio.to_thread(self._collect_edital_uuids)
 
             # ⭐ VERIFICAR EMBEDDING FUNCTION ATIVA
             embedding_info = {
@@ -338,13 +599,16 @@ class ChromaDBService:
             except Exception as e:
                 embedding_info["error"] = str(e)
 
-            return {
+            stats = {
                 "total_chunks": total_docs,
                 "total_editais": len(unique_editais),
                 "collection_name": self.collection_name,
                 "unique_editais_ids": list(unique_editais),
                 "embedding_info": embedding_info  # ⭐ ADICIONAR INFO DO MODELO
             }
+            if generation == self._write_generation:
+                self._stats_cache = (time.monotonic(), copy.deepcopy(stats))
+            return stats
 
         except Exception as e:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao obter estatísticas: {e}")
@@ -1,72 +1,47 @@
 """
 CONFAP Scraper Service - Serviço de raspagem do CONFAP
 """
-import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
-import pdfplumber
-from io import BytesIO
-import asyncio
-from concurrent.futures import ProcessPoolExecutor
 import re
 
+from ...domain.repositories.pdf_cache_repository import PdfCacheRepository
+from .base_scraper_service import BaseScraperService
 
-def _extract_pdf_text_sync(pdf_content: bytes) -> str:
-    """
-    Função auxiliar síncrona para extrair texto de PDF (executada em ProcessPool).
-
-    Args:
-        pdf_content: Conteúdo binário do PDF
-
-    Returns:
-        str: Texto extraído
-    """
-    pdf_bytes = BytesIO(pdf_content)
-    texto_completo = ''
 
-    with pdfplumber.open(pdf_bytes) as pdf:
-        total_paginas = len(pdf.pages)
+# Padrões de data comuns em editais CONFAP (compilados uma vez, usados por edital)
+_DEADLINE_PATTERNS = [
+    re.compile(r'Data de Encerramento[:\s]+(\d{2}/\d{2}/\d{4})', re.IGNORECASE),  # Data de Encerramento: 17/11/2025
+    re.compile(r'Prazo.*?(\d{2}/\d{2}/\d{4})', re.IGNORECASE),  # Prazo para envio: 17/11/2025
+    re.compile(r'até\s+(\d{2}/\d{2}/\d{4})', re.IGNORECASE),  # até 17/11/2025
+    re.compile(r'(\d{2}/\d{2}/\d{4})'),  # 17/11/2025 (genérico)
+]
 
-        for pagina_num, pagina in enumerate(pdf.pages, 1):
-            texto_pagina = pagina.extract_text()
-            if texto_pagina:
-                texto_completo += f"\n--- Página {pagina_num} ---\n{texto_pagina}\n"
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+_DETAIL_LINK_RE = re.compile(r'Ver detalhes', re.IGNORECASE)
+_STATUS_RE = re.compile(r'Em andamento|Encerrado|Aberto', re.IGNORECASE)
 
-    return texto_completo
 
-
-class ConfapScraperService:
+class ConfapScraperService(BaseScraperService):
     """
     Serviço para raspagem de editais do CONFAP.
     """
 
-    def __init__(self, max_workers: int = 2):
+    def __init__(self, max_workers: int = 2, pdf_cache_repository: Optional[PdfCacheRepository] = None):
         self.base_url = "https://confap.org.br/pt/editais/status=em-andamento"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        self.executor = ProcessPoolExecutor(max_workers=max_workers)
-
-    def _parse_date(self, date_str: str) -> Optional[date]:
-        """
-        Converte string de data DD/MM/YYYY para objeto date.
-
-        Args:
-            date_str: String da data (ex: "17/11/2025")
-
-        Returns:
-            Optional[date]: Objeto date ou None se falhar
-        """
-        try:
-            return datetime.strptime(date_str, "%d/%m/%Y").date()
-        except:
-            return None
+        super().__init__(
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+                'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Connection': 'keep-alive',
+                'Upgrade-Insecure-Requests': '1',
+            },
+            max_workers=max_workers,
+            pdf_cache_repository=pdf_cache_repository
+        )
 
     def _extract_deadline_from_text(self, text: str) -> Optional[date]:
         """
@@ -78,16 +53,8 @@ class ConfapScraperService:
         Returns:
             Optional[date]: Data encontrada ou None
         """
-        # Padrões de data comuns em editais CONFAP
-        patterns = [
-            r'Data de Encerramento[:\s]+(\d{2}/\d{2}/\d{4})',  # Data de Encerramento: 17/11/2025
-            r'Prazo.*?(\d{2}/\d{2}/\d{4})',  # Prazo para envio: 17/11/2025
-            r'até\s+(\d{2}/\d{2}/\d{4})',  # até 17/11/2025
-            r'(\d{2}/\d{2}/\d{4})',  # 17/11/2025 (genérico)
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DEADLINE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 date_str = match.group(1)
                 parsed = self._parse_date(date_str)
@@ -107,7 +74,7 @@ class ConfapScraperService:
             Optional[int]: Ano encontrado ou None
         """
         # Buscar padrões de ano (2024, 2025, etc.)
-        match = re.search(r'\b(20\d{2})\b', text)
+        match = _YEAR_RE.search(text)
         if match:
             return int(match.group(1))
         return None
@@ -131,11 +98,10 @@ class ConfapScraperService:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Iniciando raspagem do CONFAP...")
 
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(self.base_url, headers=self.headers)
-                response.raise_for_status()
+            response = await self.client.get(self.base_url)
+            response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml')
 
             # Encontrar todos os editais (links "Ver detalhes")
             editais = []
@@ -143,7 +109,7 @@ class ConfapScraperService:
             processed_urls = set()  # Evitar duplicatas
 
             # Buscar todos os links "Ver detalhes"
-            detail_links = soup.find_all('a', href=True, string=re.compile(r'Ver detalhes', re.IGNORECASE))
+            detail_links = soup.find_all('a', href=True, string=_DETAIL_LINK_RE)
 
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Encontrados {len(detail_links)} editais")
 
@@ -179,7 +145,7 @@ class ConfapScraperService:
                     # Buscar status (geralmente está próximo ao título)
                     status = "Em andamento"  # Padrão, já que estamos na página de editais em andamento
                     if parent:
-                        status_tag = parent.find(string=re.compile(r'Em andamento|Encerrado|Aberto', re.IGNORECASE))
+                        status_tag = parent.find(string=_STATUS_RE)
                         if status_tag:
                             status = status_tag.strip()
                     
@@ -234,14 +200,15 @@ class ConfapScraperService:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Extraindo links de download de: {detail_url}")
 
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(detail_url, headers=self.headers)
-                response.raise_for_status()
+            response = await self.client.get(detail_url)
+            response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Página de detalhes: só os links interessam, o resto do DOM nem é montado
+            soup = BeautifulSoup(response.text, 'lxml', parse_only=SoupStrainer('a', href=True))
 
             # Buscar todos os links que contenham "download" no href
             download_links = []
+            seen_urls = set()  # Mesmo arquivo costuma aparecer em mais de um link da página
             all_links = soup.find_all('a', href=True)
 
             for link in all_links:
@@ -256,7 +223,10 @@ class ConfapScraperService:
                         download_url = f"https://confap.org.br{href}"
                     else:
                         download_url = f"https://confap.org.br/{href}"
-                    
+
+                    if download_url in seen_urls:
+                        continue
+                    seen_urls.add(download_url)
                     download_links.append(download_url)
                     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📎 Link de download encontrado: {download_url}")
 
@@ -274,7 +244,10 @@ class ConfapScraperService:
                             download_url = f"https://confap.org.br{href}"
                         else:
                             download_url = f"https://confap.org.br/{href}"
-                        
+
+                        if download_url in seen_urls:
+                            continue
+                        seen_urls.add(download_url)
                         download_links.append(download_url)
                         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📎 PDF encontrado: {download_url}")
 
@@ -285,81 +258,8 @@ class ConfapScraperService:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao extrair links de download: {e}")
             return []
 
-    async def download_and_extract_pdf(self, url: str, max_retries: int = 3) -> Optional[str]:
-        """
-        Baixa um PDF e extrai o texto com retry automático.
-
-        Args:
-            url: URL do PDF
-            max_retries: Número máximo de tentativas
-
-        Returns:
-            Optional[str]: Texto extraído ou None se falhar
-        """
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Baixando PDF: {url}")
-
-        for attempt in range(max_retries):
-            try:
-                # Timeout mais alto e configurações de retry
-                timeout = httpx.Timeout(120.0, connect=30.0)
-
-                async with httpx.AsyncClient(
-                    timeout=timeout,
-                    follow_redirects=True,
-                    limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-                ) as client:
-                    response = await client.get(url, headers=self.headers)
-                    response.raise_for_status()
-
-                content_type = response.headers.get('Content-Type', '')
-
-                # CONFAP: links com "download" retornam PDFs mesmo sem Content-Type correto
-                # Validar se é PDF pelo conteúdo ou pela URL
-                is_pdf_url = 'download' in url.lower() or url.lower().endswith('.pdf')
-                is_pdf_content = 'application/pdf' in content_type
-                
-                # Verificar se o conteúdo começa com assinatura PDF (%PDF)
-                is_pdf_signature = response.content[:4] == b'%PDF'
-
-                if not (is_pdf_content or is_pdf_url or is_pdf_signature):
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Não é um PDF: {content_type}")
-                    return None
-
-                # Extrair texto do PDF em processo separado (não bloqueia a API)
-                loop = asyncio.get_event_loop()
-                texto_completo = await loop.run_in_executor(
-                    self.executor,
-                    _extract_pdf_text_sync,
-                    response.content
-                )
-
-                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Texto extraído: {len(texto_completo)} caracteres")
-                return texto_completo
-
-            except (httpx.ReadTimeout, httpx.ConnectTimeout) as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # Backoff exponencial: 2s, 4s, 6s
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ Timeout (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Timeout após {max_retries} tentativas: {e}")
-                    return None
-
-            except httpx.RemoteProtocolError as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 3  # Backoff maior para erros de protocolo
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ Servidor desconectou (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Servidor desconectou após {max_retries} tentativas: {e}")
-                    return None
-
-            except Exception as e:
-                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao baixar/processar PDF: {e}")
-                return None
-
-        return None
-
-    def shutdown(self):
-        """Encerra o executor de processos"""
-        self.executor.shutdown(wait=True)
+    def _is_pdf(self, url: str, content_type: str, content: bytes) -> bool:
+        """CONFAP: links com "download" retornam PDFs mesmo sem Content-Type correto"""
+        # Validar se é PDF pelo conteúdo, pela URL ou pela assinatura (%PDF)
+        is_pdf_url = 'download' in url.lower() or url.lower().endswith('.pdf')
+        return 'application/pdf' in content_type or is_pdf_url or content[:4] == b'%PDF'
@@ -1,72 +1,43 @@
 """
 FINEP Scraper Service - Serviço de raspagem da FINEP
 """
-import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
-import pdfplumber
-from io import BytesIO
-import asyncio
-from concurrent.futures import ProcessPoolExecutor
 import re
 
+from ...domain.repositories.pdf_cache_repository import PdfCacheRepository
+from .base_scraper_service import BaseScraperService
 
-def _extract_pdf_text_sync(pdf_content: bytes) -> str:
-    """
-    Função auxiliar síncrona para extrair texto de PDF (executada em ProcessPool).
-
-    Args:
-        pdf_content: Conteúdo binário do PDF
-
-    Returns:
-        str: Texto extraído
-    """
-    pdf_bytes = BytesIO(pdf_content)
-    texto_completo = ''
 
-    with pdfplumber.open(pdf_bytes) as pdf:
-        total_paginas = len(pdf.pages)
+# Padrões de data comuns (compilados uma vez)
+_DATE_PATTERNS = [
+    re.compile(r'(\d{2}/\d{2}/\d{4})'),  # DD/MM/YYYY
+    re.compile(r'(\d{2}\.\d{2}\.\d{4})'),  # DD.MM.YYYY
+]
 
-        for pagina_num, pagina in enumerate(pdf.pages, 1):
-            texto_pagina = pagina.extract_text()
-            if texto_pagina:
-                texto_completo += f"\n--- Página {pagina_num} ---\n{texto_pagina}\n"
+_CHAMADA_HREF_RE = re.compile(r'/chamadas-publicas/chamadapublica/\d+')
 
-    return texto_completo
 
-
-class FinepScraperService:
+class FinepScraperService(BaseScraperService):
     """
     Serviço para raspagem de chamadas públicas da FINEP.
     """
 
-    def __init__(self, max_workers: int = 2):
+    def __init__(self, max_workers: int = 2, pdf_cache_repository: Optional[PdfCacheRepository] = None):
         self.base_url = "http://www.finep.gov.br/chamadas-publicas?situacao=aberta"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        self.executor = ProcessPoolExecutor(max_workers=max_workers)
-
-    def _parse_date(self, date_str: str) -> Optional[date]:
-        """
-        Converte string de data DD/MM/YYYY para objeto date.
-
-        Args:
-            date_str: String da data (ex: "31/12/2025")
-
-        Returns:
-            Optional[date]: Objeto date ou None se falhar
-        """
-        try:
-            return datetime.strptime(date_str, "%d/%m/%Y").date()
-        except:
-            return None
+        super().__init__(
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+                'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive',
+                'Upgrade-Insecure-Requests': '1',
+            },
+            max_workers=max_workers,
+            pdf_cache_repository=pdf_cache_repository
+        )
 
     def _extract_date_from_text(self, text: str) -> Optional[date]:
         """
@@ -78,14 +49,8 @@ class FinepScraperService:
         Returns:
             Optional[date]: Data encontrada ou None
         """
-        # Padrões de data comuns
-        patterns = [
-            r'(\d{2}/\d{2}/\d{4})',  # DD/MM/YYYY
-            r'(\d{2}\.\d{2}\.\d{4})',  # DD.MM.YYYY
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
+        for pattern in _DATE_PATTERNS:
+            matches = pattern.findall(text)
             if matches:
                 # Pegar a última data encontrada (geralmente é a data limite)
                 date_str = matches[-1].replace('.', '/')
@@ -113,11 +78,10 @@ class FinepScraperService:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Iniciando raspagem da FINEP...")
 
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(self.base_url, headers=self.headers)
-                response.raise_for_status()
+            response = await self.client.get(self.base_url)
+            response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml')
 
             chamadas = []
             today = date.today()
@@ -125,7 +89,7 @@ class FinepScraperService:
 
             # Buscar todos os links de chamadas (geralmente em h3 ou links específicos)
             # Padrão FINEP: links para /chamadas-publicas/chamadapublica/XXX
-            all_links = soup.find_all('a', href=re.compile(r'/chamadas-publicas/chamadapublica/\d+'))
+            all_links = soup.find_all('a', href=_CHAMADA_HREF_RE)
 
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Encontrados {len(all_links)} links de chamadas")
 
@@ -206,14 +170,15 @@ class FinepScraperService:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Extraindo links de PDFs de: {detail_url}")
 
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(detail_url, headers=self.headers)
-                response.raise_for_status()
+            response = await self.client.get(detail_url)
+            response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Página de detalhes: só os links interessam, o resto do DOM nem é montado
+            soup = BeautifulSoup(response.text, 'lxml', parse_only=SoupStrainer('a', href=True))
 
             # Buscar todos os links que contenham ".pdf" no href
             pdf_links = []
+            seen_urls = set()  # Mesmo PDF costuma aparecer em mais de um link da página
             all_links = soup.find_all('a', href=True)
 
             for link in all_links:
@@ -229,7 +194,10 @@ class FinepScraperService:
                     else:
                         # Concatenar com URL base conforme especificado
                         pdf_url = f"http://www.finep.gov.br/{href}"
-                    
+
+                    if pdf_url in seen_urls:
+                        continue
+                    seen_urls.add(pdf_url)
                     pdf_links.append(pdf_url)
                     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📎 PDF encontrado: {pdf_url}")
 
@@ -240,80 +208,6 @@ class FinepScraperService:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao extrair links de PDFs: {e}")
             return []
 
-    async def download_and_extract_pdf(self, url: str, max_retries: int = 3) -> Optional[str]:
-        """
-        Baixa um PDF e extrai o texto com retry automático.
-
-        Args:
-            url: URL do PDF
-            max_retries: Número máximo de tentativas
-
-        Returns:
-            Optional[str]: Texto extraído ou None se falhar
-        """
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Baixando PDF: {url}")
-
-        for attempt in range(max_retries):
-            try:
-                # Timeout mais alto e configurações de retry
-                timeout = httpx.Timeout(120.0, connect=30.0)
-
-                async with httpx.AsyncClient(
-                    timeout=timeout,
-                    follow_redirects=True,
-                    limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-                ) as client:
-                    response = await client.get(url, headers=self.headers)
-                    response.raise_for_status()
-
-                content_type = response.headers.get('Content-Type', '')
-
-                # FINEP: validar se é PDF pelo conteúdo ou pela URL
-                is_pdf_url = '.pdf' in url.lower()
-                is_pdf_content = 'application/pdf' in content_type
-                
-                # Verificar se o conteúdo começa com assinatura PDF (%PDF)
-                is_pdf_signature = response.content[:4] == b'%PDF'
-
-                if not (is_pdf_content or is_pdf_url or is_pdf_signature):
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Não é um PDF: {content_type}")
-                    return None
-
-                # Extrair texto do PDF em processo separado (não bloqueia a API)
-                loop = asyncio.get_event_loop()
-                texto_completo = await loop.run_in_executor(
-                    self.executor,
-                    _extract_pdf_text_sync,
-                    response.content
-                )
-
-                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Texto extraído: {len(texto_completo)} caracteres")
-                return texto_completo
-
-            except (httpx.ReadTimeout, httpx.ConnectTimeout) as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # Backoff exponencial: 2s, 4s, 6s
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ Timeout (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Timeout após {max_retries} tentativas: {e}")
-                    return None
-
-            except httpx.RemoteProtocolError as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 3  # Backoff maior para erros de protocolo
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏳ Servidor desconectou (tentativa {attempt + 1}/{max_retries}). Aguardando {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Servidor desconectou após {max_retries} tentativas: {e}")
-                    return None
-
-            except Exception as e:
-                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao baixar/processar PDF: {e}")
-                return None
-
-        return None
-
-    def shutdown(self):
-        """Encerra o executor de processos"""
-        self.executor.shutdown(wait=True)
+    def _is_pdf(self, url: str, content_type: str, content: bytes) -> bool:
+        """FINEP: validar se é PDF pelo conteúdo, pela URL ou pela assinatura (%PDF)"""
+        return 'application/pdf' in content_type or '.pdf' in url.lower() or content[:4] == b'%PDF'
@@ -4,13 +4,14 @@ Job Scheduler Service - Agendamento e execução de jobs
 import asyncio
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Callable, Awaitable, Any
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from ...domain.entities.job_execution import JobExecution
 from ...domain.repositories.job_repository import JobRepository
 from ...domain.repositories.edital_repository import EditalRepository
+from .base_scraper_service import BaseScraperService
 from .cnpq_scraper_service import CNPqScraperService
 from .fapesq_scraper_service import FapesqScraperService
 from .paraiba_gov_scraper_service import ParaibaGovScraperService
@@ -20,6 +21,96 @@ from .finep_scraper_service import FinepScraperService
 from .openai_extractor_service import OpenAIExtractorService
 
 
+# Páginas de detalhes buscadas em paralelo por job (educado com sites de agências)
+_DETAIL_FETCH_CONCURRENCY = 4
+
+# PDFs baixados à frente do que o laço do job está processando (janela deslizante:
+# limita a memória com textos extraídos e ainda não consumidos). Mínimo; sobe até o
+# número de processos do scraper, para que cada worker tenha um PDF para extrair
+_PDF_PREFETCH_WINDOW = 4
+
+
+class _PdfPrefetcher:
+    """
+    Baixa e extrai PDFs em segundo plano, numa janela deslizante à frente do laço do job.
+
+    O download i + window só começa quando o laço consome o PDF i, e os inícios de
+    download são espaçados por `delay` segundos para não sobrecarregar os sites de origem.
+    """
+
+    def __init__(
+        self,
+        download: Callable[[str], Awaitable[Optional[str]]],
+        pdf_urls: List[str],
+        window: int,
+        delay: float
+    ):
+        """
+        Inicializa a janela e dispara os primeiros downloads.
+
+        Args:
+            download: Método do scraper que baixa e extrai o texto de um PDF
+            pdf_urls: URLs dos PDFs, na ordem em que o laço vai consumi-los
+            window: Máximo de PDFs baixados e ainda não consumidos
+            delay: Intervalo mínimo entre inícios de download (segundos)
+        """
+        self._download = download
+        self._pdf_urls = pdf_urls
+        self._delay = delay
+        self._tasks: Dict[int, "asyncio.Task[Optional[str]]"] = {}
+        self._started = 0
+        self._next_start = 0.0  # Instante (loop.time) liberado para o próximo download
+
+        for _ in range(min(window, len(pdf_urls))):
+            self._start_next()
+
+    def _start_next(self):
+        """Dispara o próximo download da fila, se houver."""
+        if self._started < len(self._pdf_urls):
+            url = self._pdf_urls[self._started]
+            self._tasks[self._started] = asyncio.create_task(self._spaced_download(url))
+            self._started += 1
+
+    async def _spaced_download(self, url: str) -> Optional[str]:
+        """
+        Aguarda a vez deste download (espaçamento entre inícios) e baixa o PDF.
+
+        Args:
+            url: URL do PDF
+
+        Returns:
+            Optional[str]: Texto extraído
+        """
+        loop = asyncio.get_running_loop()
+        start_at = max(loop.time(), self._next_start)
+        self._next_start = start_at + self._delay
+        await asyncio.sleep(start_at - loop.time())
+        return await self._download(url)
+
+    async def get(self, index: int) -> Optional[str]:
+        """
+        Aguarda o texto do PDF `index` (0-based, em ordem) e libera a vaga na janela.
+
+        Args:
+            index: Posição do PDF em pdf_urls
+
+        Returns:
+            Optional[str]: Texto extraído
+        """
+        task = self._tasks.pop(index)
+        try:
+            return await task
+        finally:
+            self._start_next()
+
+    def cancel(self):
+        """Cancela downloads e extrações que não chegaram a ser consumidos."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._started = len(self._pdf_urls)
+
+
 class JobSchedulerService:
     """
     Serviço para agendamento e execução de jobs.
@@ -88,6 +179,56 @@ class JobSchedulerService:
         self.scheduler.shutdown()
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🛑 Scheduler encerrado")
 
+    async def _fetch_detail_links(
+        self,
+        fetch: Callable[[str], Awaitable[List[str]]],
+        detail_urls: List[str]
+    ) -> List[Any]:
+        """
+        Busca os links de todas as páginas de detalhes em paralelo, com concorrência limitada.
+
+        Args:
+            fetch: Método do scraper que extrai os links de uma página de detalhes
+            detail_urls: URLs das páginas de detalhes
+
+        Returns:
+            List[Any]: Lista de links (ou a exceção levantada) por página, na ordem de entrada
+        """
+        semaphore = asyncio.Semaphore(_DETAIL_FETCH_CONCURRENCY)
+
+        async def _bounded(url: str) -> List[str]:
+            async with semaphore:
+                return await fetch(url)
+
+        return await asyncio.gather(*(_bounded(url) for url in detail_urls), return_exceptions=True)
+
+    def _prefetch_pdfs(
+        self,
+        scraper: BaseScraperService,
+        pdf_urls: List[str]
+    ) -> _PdfPrefetcher:
+        """
+        Dispara o download e a extração dos PDFs em segundo plano, numa janela deslizante.
+
+        O laço do job consome os PDFs na ordem com `await downloads.get(i)`, então os
+        próximos já estão sendo baixados enquanto o atual passa pela extração OpenAI.
+        O laço deve chamar `downloads.cancel()` num finally. A janela acompanha o pool
+        de processos do scraper (um PDF por worker), com piso em _PDF_PREFETCH_WINDOW.
+
+        Args:
+            scraper: Scraper que baixa e extrai o texto dos PDFs
+            pdf_urls: URLs dos PDFs
+
+        Returns:
+            _PdfPrefetcher: Janela de downloads, consumida em ordem
+        """
+        return _PdfPrefetcher(
+            scraper.download_and_extract_pdf,
+            pdf_urls,
+            window=max(_PDF_PREFETCH_WINDOW, scraper.max_workers),
+            delay=self.pdf_processing_delay_ms / 1000.0
+        )
+
     async def execute_cnpq_job_now(self) -> str:
         """
         Executa o job de raspagem CNPq AGORA (manualmente).
@@ -227,47 +368,52 @@ class JobSchedulerService:
             job.update_progress(0, len(urls))
             await self.job_repo.update(job)
 
+            downloads = self._prefetch_pdfs(self.cnpq_scraper, urls)
+
             # 2. Processar cada URL
-            for i, url in enumerate(urls, 1):
-                # Verificar cancelamento
-                if not self.running_jobs.get(job_id, True):
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
-                    break
+            try:
+                for i, url in enumerate(urls, 1):
+                    # Verificar cancelamento
+                    if not self.running_jobs.get(job_id, True):
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
+                        break
 
-                print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Processando edital {i}/{len(urls)}: {url}")
+                    print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Processando edital {i}/{len(urls)}: {url}")
 
-                try:
-                    # Baixar e extrair PDF
-                    texto = await self.cnpq_scraper.download_and_extract_pdf(url)
+                    try:
+                        # Baixar e extrair PDF
+                        texto = await downloads.get(i - 1)
 
-                    if not texto:
-                        job.add_error(url, "Não foi possível extrair texto do PDF", 0)
-                        await self.job_repo.update(job)
-                        continue
+                        if not texto:
+                            job.add_error(url, "Não foi possível extrair texto do PDF", 0)
+                            await self.job_repo.update(job)
+                            continue
 
-                    # Gerar UUID para o edital
-                    edital_uuid = str(uuid.uuid4())
+                        # Gerar UUID para o edital
+                        edital_uuid = str(uuid.uuid4())
 
-                    # Extrair variáveis com OpenAI (salva progressivamente)
-                    await self.openai_service.extract_variables_progressive(
-                        text=texto,
-                        edital_uuid=edital_uuid,
-                        pdf_url=url
-                    )
+                        # Extrair variáveis com OpenAI (salva progressivamente)
+                        await self.openai_service.extract_variables_progressive(
+                            text=texto,
+                            edital_uuid=edital_uuid,
+                            pdf_url=url
+                        )
 
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Edital processado com sucesso")
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Edital processado com sucesso")
 
-                except Exception as e:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar edital: {e}")
-                    job.add_error(url, str(e), 0)
-                    await self.job_repo.update(job)
+                    except Exception as e:
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar edital: {e}")
+                        job.add_error(url, str(e), 0)
+                        await self.job_repo.update(job)
 
-                # Atualizar progresso
-                job.update_progress(i, len(urls))
-                await self.job_repo.update(job)
+                    # Atualizar progresso
+                    job.update_progress(i, len(urls))
+                    await self.job_repo.update(job)
 
-                # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
-                await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                    # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
+                    await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+            finally:
+                downloads.cancel()
 
             # 3. Finalizar job
             job.complete()
@@ -318,69 +464,74 @@ class JobSchedulerService:
             job.update_progress(0, len(editais_info))
             await self.job_repo.update(job)
 
+            downloads = self._prefetch_pdfs(self.fapesq_scraper, [edital_info['pdf_url'] for edital_info in editais_info])
+
             # 2. Processar cada edital
-            for i, edital_info in enumerate(editais_info, 1):
-                # Verificar cancelamento
-                if not self.running_jobs.get(job_id, True):
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
-                    break
+            try:
+                for i, edital_info in enumerate(editais_info, 1):
+                    # Verificar cancelamento
+                    if not self.running_jobs.get(job_id, True):
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
+                        break
 
-                pdf_url = edital_info['pdf_url']
-                titulo = edital_info['titulo']
+                    pdf_url = edital_info['pdf_url']
+                    titulo = edital_info['titulo']
 
-                print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Processando edital {i}/{len(editais_info)}: {titulo[:60]}...")
+                    print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Processando edital {i}/{len(editais_info)}: {titulo[:60]}...")
 
-                try:
-                    # Baixar e extrair PDF
-                    texto = await self.fapesq_scraper.download_and_extract_pdf(pdf_url)
+                    try:
+                        # Baixar e extrair PDF
+                        texto = await downloads.get(i - 1)
 
-                    if not texto:
-                        job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
-                        await self.job_repo.update(job)
-                        continue
+                        if not texto:
+                            job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
+                            await self.job_repo.update(job)
+                            continue
 
-                    # Gerar UUID para o edital
-                    edital_uuid = str(uuid.uuid4())
-
-                    # Extrair variáveis com OpenAI (salva progressivamente)
-                    extracted = await self.openai_service.extract_variables_progressive(
-                        text=texto,
-                        edital_uuid=edital_uuid,
-                        pdf_url=pdf_url
-                    )
-
-                    # Adicionar metadata extra do FAPESQ ao MongoDB
-                    fapesq_metadata = {
-                        'apelido_edital': titulo,
-                        'descricao': edital_info.get('descricao'),
-                        'data_limite': edital_info.get('data_limite').isoformat() if edital_info.get('data_limite') else None,
-                        'data_publicacao': edital_info.get('data_publicacao').isoformat() if edital_info.get('data_publicacao') else None,
-                        'financiador_1': 'FAPESQ-PB',
-                        'origem': 'FAPESQ',
-                        'link': pdf_url  # Garantir que o link do PDF seja salvo
-                    }
-
-                    # Merge metadata extra e salvar novamente
-                    merged_vars = {**extracted, **fapesq_metadata}
-                    await self.edital_repo.save_final_extraction(
-                        edital_uuid=edital_uuid,
-                        consolidated_variables=merged_vars,
-                        status="completed"
-                    )
-
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Edital processado com sucesso")
+                        # Gerar UUID para o edital
+                        edital_uuid = str(uuid.uuid4())
 
-                except Exception as e:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar edital: {e}")
-                    job.add_error(pdf_url, str(e), 0)
-                    await self.job_repo.update(job)
+                        # Extrair variáveis com OpenAI (salva progressivamente)
+                        extracted = await self.openai_service.extract_variables_progressive(
+                            text=texto,
+                            edital_uuid=edital_uuid,
+                            pdf_url=pdf_url
+                        )
 
-                # Atualizar progresso
-                job.update_progress(i, len(editais_info))
-                await self.job_repo.update(job)
+                        # Adicionar metadata extra do FAPESQ ao MongoDB
+                        fapesq_metadata = {
+                            'apelido_edital': titulo,
+                            'descricao': edital_info.get('descricao'),
+                            'data_limite': edital_info.get('data_limite').isoformat() if edital_info.get('data_limite') else None,
+                            'data_publicacao': edital_info.get('data_publicacao').isoformat() if edital_info.get('data_publicacao') else None,
+                            'financiador_1': 'FAPESQ-PB',
+                            'origem': 'FAPESQ',
+                            'link': pdf_url  # Garantir que o link do PDF seja salvo
+                        }
+
+                        # Merge metadata extra e salvar novamente
+                        merged_vars = {**extracted, **fapesq_metadata}
+                        await self.edital_repo.save_final_extraction(
+                            edital_uuid=edital_uuid,
+                            consolidated_variables=merged_vars,
+                            status="completed"
+                        )
 
-                # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
-                await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Edital processado com sucesso")
+
+                    except Exception as e:
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar edital: {e}")
+                        job.add_error(pdf_url, str(e), 0)
+                        await self.job_repo.update(job)
+
+                    # Atualizar progresso
+                    job.update_progress(i, len(editais_info))
+                    await self.job_repo.update(job)
+
+                    # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
+                    await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+            finally:
+                downloads.cancel()
 
             # 3. Finalizar job
             job.complete()
@@ -431,68 +582,73 @@ class JobSchedulerService:
             job.update_progress(0, len(editais_info))
             await self.job_repo.update(job)
 
+            downloads = self._prefetch_pdfs(self.paraiba_gov_scraper, [edital_info['pdf_url'] for edital_info in editais_info])
+
             # 2. Processar cada edital
-            for i, edital_info in enumerate(editais_info, 1):
-                # Verificar cancelamento
-                if not self.running_jobs.get(job_id, True):
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
-                    break
+            try:
+                for i, edital_info in enumerate(editais_info, 1):
+                    # Verificar cancelamento
+                    if not self.running_jobs.get(job_id, True):
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
+                        break
 
-                pdf_url = edital_info['pdf_url']
-                titulo = edital_info['titulo']
+                    pdf_url = edital_info['pdf_url']
+                    titulo = edital_info['titulo']
 
-                print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Processando edital {i}/{len(editais_info)}: {titulo[:60]}...")
+                    print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Processando edital {i}/{len(editais_info)}: {titulo[:60]}...")
 
-                try:
-                    # Baixar e extrair PDF
-                    texto = await self.paraiba_gov_scraper.download_and_extract_pdf(pdf_url)
+                    try:
+                        # Baixar e extrair PDF
+                        texto = await downloads.get(i - 1)
 
-                    if not texto:
-                        job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
-                        await self.job_repo.update(job)
-                        continue
+                        if not texto:
+                            job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
+                            await self.job_repo.update(job)
+                            continue
 
-                    # Gerar UUID para o edital
-                    edital_uuid = str(uuid.uuid4())
-
-                    # Extrair variáveis com OpenAI (salva progressivamente)
-                    extracted = await self.openai_service.extract_variables_progressive(
-                        text=texto,
-                        edital_uuid=edital_uuid,
-                        pdf_url=pdf_url
-                    )
-
-                    # Adicionar metadata extra do Paraíba Gov ao MongoDB
-                    paraiba_gov_metadata = {
-                        'apelido_edital': titulo,
-                        'descricao': edital_info.get('descricao'),
-                        'data_limite': edital_info.get('data_limite').isoformat() if edital_info.get('data_limite') else None,
-                        'financiador_1': 'Governo da Paraíba - SECTIES',
-                        'origem': 'Paraíba Gov',
-                        'link': pdf_url  # Garantir que o link do PDF seja salvo
-                    }
-
-                    # Merge metadata extra e salvar novamente
-                    merged_vars = {**extracted, **paraiba_gov_metadata}
-                    await self.edital_repo.save_final_extraction(
-                        edital_uuid=edital_uuid,
-                        consolidated_variables=merged_vars,
-                        status="completed"
-                    )
-
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Edital processado com sucesso")
+                        # Gerar UUID para o edital
+                        edital_uuid = str(uuid.uuid4())
 
-                except Exception as e:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar edital: {e}")
-                    job.add_error(pdf_url, str(e), 0)
-                    await self.job_repo.update(job)
+                        # Extrair variáveis com OpenAI (salva progressivamente)
+                        extracted = await self.openai_service.extract_variables_progressive(
+                            text=texto,
+                            edital_uuid=edital_uuid,
+                            pdf_url=pdf_url
+                        )
 
-                # Atualizar progresso
-                job.update_progress(i, len(editais_info))
-                await self.job_repo.update(job)
+                        # Adicionar metadata extra do Paraíba Gov ao MongoDB
+                        paraiba_gov_metadata = {
+                            'apelido_edital': titulo,
+                            'descricao': edital_info.get('descricao'),
+                            'data_limite': edital_info.get('data_limite').isoformat() if edital_info.get('data_limite') else None,
+                            'financiador_1': 'Governo da Paraíba - SECTIES',
+                            'origem': 'Paraíba Gov',
+                            'link': pdf_url  # Garantir que o link do PDF seja salvo
+                        }
 
-                # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
-                await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                        # Merge metadata extra e salvar novamente
+                        merged_vars = {**extracted, **paraiba_gov_metadata}
+                        await self.edital_repo.save_final_extraction(
+                            edital_uuid=edital_uuid,
+                            consolidated_variables=merged_vars,
+                            status="completed"
+                        )
+
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Edital processado com sucesso")
+
+                    except Exception as e:
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar edital: {e}")
+                        job.add_error(pdf_url, str(e), 0)
+                        await self.job_repo.update(job)
+
+                    # Atualizar progresso
+                    job.update_progress(i, len(editais_info))
+                    await self.job_repo.update(job)
+
+                    # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
+                    await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+            finally:
+                downloads.cancel()
 
             # 3. Finalizar job
             job.complete()
@@ -570,7 +726,12 @@ class JobSchedulerService:
             total_pdfs = 0
             processed_pdfs = 0
 
-            # 2. Para cada edital, extrair links de download
+            # 2. Extrair links de download de todas as páginas de detalhes em paralelo
+            links_por_edital = await self._fetch_detail_links(
+                self.confap_scraper.extract_download_links,
+                [edital_info['url'] for edital_info in editais_info]
+            )
+
             for i, edital_info in enumerate(editais_info, 1):
                 # Verificar cancelamento
                 if not self.running_jobs.get(job_id, True):
@@ -583,8 +744,9 @@ class JobSchedulerService:
                 print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📋 Processando edital {i}/{len(editais_info)}: {titulo[:60]}...")
 
                 try:
-                    # Extrair links de download da página de detalhes
-                    download_links = await self.confap_scraper.extract_download_links(detail_url)
+                    download_links = links_por_edital[i - 1]
+                    if isinstance(download_links, Exception):
+                        raise download_links
 
                     if not download_links:
                         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Nenhum link de download encontrado para este edital")
@@ -597,70 +759,75 @@ class JobSchedulerService:
                     job.update_progress(processed_pdfs, total_pdfs)
                     await self.job_repo.update(job)
 
-                    # 3. Processar cada PDF encontrado
-                    for pdf_idx, pdf_url in enumerate(download_links, 1):
-                        # Verificar cancelamento
-                        if not self.running_jobs.get(job_id, True):
-                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
-                            break
-
-                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Baixando PDF {pdf_idx}/{len(download_links)}: {pdf_url}")
-
-                        try:
-                            # Baixar e extrair PDF
-                            texto = await self.confap_scraper.download_and_extract_pdf(pdf_url)
+                    downloads = self._prefetch_pdfs(self.confap_scraper, download_links)
 
-                            if not texto:
-                                job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
-                                await self.job_repo.update(job)
-                                processed_pdfs += 1
-                                job.update_progress(processed_pdfs, total_pdfs)
+                    # 3. Processar cada PDF encontrado
+                    try:
+                        for pdf_idx, pdf_url in enumerate(download_links, 1):
+                            # Verificar cancelamento
+                            if not self.running_jobs.get(job_id, True):
+                                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
+                                break
+
+                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Baixando PDF {pdf_idx}/{len(download_links)}: {pdf_url}")
+
+                            try:
+                                # Baixar e extrair PDF
+                                texto = await downloads.get(pdf_idx - 1)
+
+                                if not texto:
+                                    job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
+                                    await self.job_repo.update(job)
+                                    processed_pdfs += 1
+                                    job.update_progress(processed_pdfs, total_pdfs)
+                                    await self.job_repo.update(job)
+                                    continue
+
+                                # Gerar UUID para o edital
+                                edital_uuid = str(uuid.uuid4())
+
+                                # Extrair variáveis com OpenAI (salva progressivamente)
+                                extracted = await self.openai_service.extract_variables_progressive(
+                                    text=texto,
+                                    edital_uuid=edital_uuid,
+                                    pdf_url=pdf_url
+                                )
+
+                                # Adicionar metadata extra do CONFAP ao MongoDB
+                                confap_metadata = {
+                                    'apelido_edital': titulo,
+                                    'url_detalhes': detail_url,
+                                    'status': edital_info.get('status', 'Em andamento'),
+                                    'ano': edital_info.get('ano'),
+                                    'financiador_1': 'CONFAP',
+                                    'origem': 'CONFAP',
+                                    'link': pdf_url  # Garantir que o link do PDF seja salvo
+                                }
+
+                                # Merge metadata extra e salvar novamente
+                                merged_vars = {**extracted, **confap_metadata}
+                                await self.edital_repo.save_final_extraction(
+                                    edital_uuid=edital_uuid,
+                                    consolidated_variables=merged_vars,
+                                    status="completed"
+                                )
+
+                                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ PDF processado com sucesso")
+
+                            except Exception as e:
+                                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar PDF: {e}")
+                                job.add_error(pdf_url, str(e), 0)
                                 await self.job_repo.update(job)
-                                continue
-
-                            # Gerar UUID para o edital
-                            edital_uuid = str(uuid.uuid4())
 
-                            # Extrair variáveis com OpenAI (salva progressivamente)
-                            extracted = await self.openai_service.extract_variables_progressive(
-                                text=texto,
-                                edital_uuid=edital_uuid,
-                                pdf_url=pdf_url
-                            )
-
-                            # Adicionar metadata extra do CONFAP ao MongoDB
-                            confap_metadata = {
-                                'apelido_edital': titulo,
-                                'url_detalhes': detail_url,
-                                'status': edital_info.get('status', 'Em andamento'),
-                                'ano': edital_info.get('ano'),
-                                'financiador_1': 'CONFAP',
-                                'origem': 'CONFAP',
-                                'link': pdf_url  # Garantir que o link do PDF seja salvo
-                            }
-
-                            # Merge metadata extra e salvar novamente
-                            merged_vars = {**extracted, **confap_metadata}
-                            await self.edital_repo.save_final_extraction(
-                                edital_uuid=edital_uuid,
-                                consolidated_variables=merged_vars,
-                                status="completed"
-                            )
-
-                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ PDF processado com sucesso")
-
-                        except Exception as e:
-                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar PDF: {e}")
-                            job.add_error(pdf_url, str(e), 0)
+                            # Atualizar progresso
+                            processed_pdfs += 1
+                            job.update_progress(processed_pdfs, total_pdfs)
                             await self.job_repo.update(job)
 
-                        # Atualizar progresso
-                        processed_pdfs += 1
-                        job.update_progress(processed_pdfs, total_pdfs)
-                        await self.job_repo.update(job)
-
-                        # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
-                        await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                            # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
+                            await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                    finally:
+                        downloads.cancel()
 
                 except Exception as e:
                     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar edital: {e}")
@@ -759,68 +926,73 @@ class JobSchedulerService:
 
                 print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📋 Processando chamada {i}/{len(chamadas_info)}: {titulo[:60]}... ({len(pdf_urls)} PDFs)")
 
+                downloads = self._prefetch_pdfs(self.capes_scraper, pdf_urls)
+
                 # 3. Processar cada PDF da chamada
-                for pdf_idx, pdf_url in enumerate(pdf_urls, 1):
-                    # Verificar cancelamento
-                    if not self.running_jobs.get(job_id, True):
-                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
-                        break
+                try:
+                    for pdf_idx, pdf_url in enumerate(pdf_urls, 1):
+                        # Verificar cancelamento
+                        if not self.running_jobs.get(job_id, True):
+                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
+                            break
 
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Baixando PDF {pdf_idx}/{len(pdf_urls)}: {pdf_url}")
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Baixando PDF {pdf_idx}/{len(pdf_urls)}: {pdf_url}")
 
-                    try:
-                        # Baixar e extrair PDF
-                        texto = await self.capes_scraper.download_and_extract_pdf(pdf_url)
+                        try:
+                            # Baixar e extrair PDF
+                            texto = await downloads.get(pdf_idx - 1)
 
-                        if not texto:
-                            job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
-                            await self.job_repo.update(job)
-                            processed_pdfs += 1
-                            job.update_progress(processed_pdfs, total_pdfs)
-                            await self.job_repo.update(job)
-                            continue
+                            if not texto:
+                                job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
+                                await self.job_repo.update(job)
+                                processed_pdfs += 1
+                                job.update_progress(processed_pdfs, total_pdfs)
+                                await self.job_repo.update(job)
+                                continue
 
-                        # Gerar UUID para o edital
-                        edital_uuid = str(uuid.uuid4())
+                            # Gerar UUID para o edital
+                            edital_uuid = str(uuid.uuid4())
 
-                        # Extrair variáveis com OpenAI (salva progressivamente)
-                        extracted = await self.openai_service.extract_variables_progressive(
-                            text=texto,
-                            edital_uuid=edital_uuid,
-                            pdf_url=pdf_url
-                        )
+                            # Extrair variáveis com OpenAI (salva progressivamente)
+                            extracted = await self.openai_service.extract_variables_progressive(
+                                text=texto,
+                                edital_uuid=edital_uuid,
+                                pdf_url=pdf_url
+                            )
 
-                        # Adicionar metadata extra da CAPES ao MongoDB
-                        capes_metadata = {
-                            'apelido_edital': titulo,
-                            'ano': ano,
-                            'financiador_1': 'CAPES',
-                            'origem': 'CAPES',
-                            'link': pdf_url  # Garantir que o link do PDF seja salvo
-                        }
+                            # Adicionar metadata extra da CAPES ao MongoDB
+                            capes_metadata = {
+                                'apelido_edital': titulo,
+                                'ano': ano,
+                                'financiador_1': 'CAPES',
+                                'origem': 'CAPES',
+                                'link': pdf_url  # Garantir que o link do PDF seja salvo
+                            }
 
-                        # Merge metadata extra e salvar novamente
-                        merged_vars = {**extracted, **capes_metadata}
-                        await self.edital_repo.save_final_extraction(
-                            edital_uuid=edital_uuid,
-                            consolidated_variables=merged_vars,
-                            status="completed"
-                        )
+                            # Merge metadata extra e salvar novamente
+                            merged_vars = {**extracted, **capes_metadata}
+                            await self.edital_repo.save_final_extraction(
+                                edital_uuid=edital_uuid,
+                                consolidated_variables=merged_vars,
+                                status="completed"
+                            )
 
-                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ PDF processado com sucesso")
+                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ PDF processado com sucesso")
 
-                    except Exception as e:
-                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar PDF: {e}")
-                        job.add_error(pdf_url, str(e), 0)
-                        await self.job_repo.update(job)
+                        except Exception as e:
+                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar PDF: {e}")
+                            job.add_error(pdf_url, str(e), 0)
+                            await self.job_repo.update(job)
 
-                    # Atualizar progresso
-                    processed_pdfs += 1
-                    job.update_progress(processed_pdfs, total_pdfs)
-                    await self.job_repo.update(job)
+                        # Atualizar progresso
+                        processed_pdfs += 1
+                        job.update_progress(processed_pdfs, total_pdfs)
+                        await self.job_repo.update(job)
 
-                    # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
-                    await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                        # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
+                        await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                finally:
+                    downloads.cancel()
 
             # 4. Finalizar job
             job.complete()
@@ -898,7 +1070,12 @@ class JobSchedulerService:
             total_pdfs = 0
             processed_pdfs = 0
 
-            # 2. Para cada chamada, extrair links de PDFs
+            # 2. Extrair links de PDFs de todas as páginas de detalhes em paralelo
+            links_por_chamada = await self._fetch_detail_links(
+                self.finep_scraper.extract_pdf_links,
+                [chamada_info['url'] for chamada_info in chamadas_info]
+            )
+
             for i, chamada_info in enumerate(chamadas_info, 1):
                 # Verificar cancelamento
                 if not self.running_jobs.get(job_id, True):
@@ -911,8 +1088,9 @@ class JobSchedulerService:
                 print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📋 Processando chamada {i}/{len(chamadas_info)}: {titulo[:60]}...")
 
                 try:
-                    # Extrair links de PDFs da página de detalhes
-                    pdf_links = await self.finep_scraper.extract_pdf_links(detail_url)
+                    pdf_links = links_por_chamada[i - 1]
+                    if isinstance(pdf_links, Exception):
+                        raise pdf_links
 
                     if not pdf_links:
                         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Nenhum PDF encontrado para esta chamada")
@@ -925,69 +1103,74 @@ class JobSchedulerService:
                     job.update_progress(processed_pdfs, total_pdfs)
                     await self.job_repo.update(job)
 
-                    # 3. Processar cada PDF encontrado
-                    for pdf_idx, pdf_url in enumerate(pdf_links, 1):
-                        # Verificar cancelamento
-                        if not self.running_jobs.get(job_id, True):
-                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
-                            break
-
-                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Baixando PDF {pdf_idx}/{len(pdf_links)}: {pdf_url}")
-
-                        try:
-                            # Baixar e extrair PDF
-                            texto = await self.finep_scraper.download_and_extract_pdf(pdf_url)
+                    downloads = self._prefetch_pdfs(self.finep_scraper, pdf_links)
 
-                            if not texto:
-                                job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
-                                await self.job_repo.update(job)
-                                processed_pdfs += 1
-                                job.update_progress(processed_pdfs, total_pdfs)
+                    # 3. Processar cada PDF encontrado
+                    try:
+                        for pdf_idx, pdf_url in enumerate(pdf_links, 1):
+                            # Verificar cancelamento
+                            if not self.running_jobs.get(job_id, True):
+                                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ Job cancelado pelo usuário")
+                                break
+
+                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📄 Baixando PDF {pdf_idx}/{len(pdf_links)}: {pdf_url}")
+
+                            try:
+                                # Baixar e extrair PDF
+                                texto = await downloads.get(pdf_idx - 1)
+
+                                if not texto:
+                                    job.add_error(pdf_url, "Não foi possível extrair texto do PDF", 0)
+                                    await self.job_repo.update(job)
+                                    processed_pdfs += 1
+                                    job.update_progress(processed_pdfs, total_pdfs)
+                                    await self.job_repo.update(job)
+                                    continue
+
+                                # Gerar UUID para o edital
+                                edital_uuid = str(uuid.uuid4())
+
+                                # Extrair variáveis com OpenAI (salva progressivamente)
+                                extracted = await self.openai_service.extract_variables_progressive(
+                                    text=texto,
+                                    edital_uuid=edital_uuid,
+                                    pdf_url=pdf_url
+                                )
+
+                                # Adicionar metadata extra da FINEP ao MongoDB
+                                finep_metadata = {
+                                    'apelido_edital': titulo,
+                                    'url_detalhes': detail_url,
+                                    'data_limite': chamada_info.get('data_limite').isoformat() if chamada_info.get('data_limite') else None,
+                                    'financiador_1': 'FINEP',
+                                    'origem': 'FINEP',
+                                    'link': pdf_url  # Garantir que o link do PDF seja salvo
+                                }
+
+                                # Merge metadata extra e salvar novamente
+                                merged_vars = {**extracted, **finep_metadata}
+                                await self.edital_repo.save_final_extraction(
+                                    edital_uuid=edital_uuid,
+                                    consolidated_variables=merged_vars,
+                                    status="completed"
+                                )
+
+                                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ PDF processado com sucesso")
+
+                            except Exception as e:
+                                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar PDF: {e}")
+                                job.add_error(pdf_url, str(e), 0)
                                 await self.job_repo.update(job)
-                                continue
 
-                            # Gerar UUID para o edital
-                            edital_uuid = str(uuid.uuid4())
-
-                            # Extrair variáveis com OpenAI (salva progressivamente)
-                            extracted = await self.openai_service.extract_variables_progressive(
-                                text=texto,
-                                edital_uuid=edital_uuid,
-                                pdf_url=pdf_url
-                            )
-
-                            # Adicionar metadata extra da FINEP ao MongoDB
-                            finep_metadata = {
-                                'apelido_edital': titulo,
-                                'url_detalhes': detail_url,
-                                'data_limite': chamada_info.get('data_limite').isoformat() if chamada_info.get('data_limite') else None,
-                                'financiador_1': 'FINEP',
-                                'origem': 'FINEP',
-                                'link': pdf_url  # Garantir que o link do PDF seja salvo
-                            }
-
-                            # Merge metadata extra e salvar novamente
-                            merged_vars = {**extracted, **finep_metadata}
-                            await self.edital_repo.save_final_extraction(
-                                edital_uuid=edital_uuid,
-                                consolidated_variables=merged_vars,
-                                status="completed"
-                            )
-
-                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ PDF processado com sucesso")
-
-                        except Exception as e:
-                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar PDF: {e}")
-                            job.add_error(pdf_url, str(e), 0)
+                            # Atualizar progresso
+                            processed_pdfs += 1
+                            job.update_progress(processed_pdfs, total_pdfs)
                             await self.job_repo.update(job)
 
-                        # Atualizar progresso
-                        processed_pdfs += 1
-                        job.update_progress(processed_pdfs, total_pdfs)
-                        await self.job_repo.update(job)
-
-                        # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
-                        await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                            # ⏱️ Delay entre PDFs para não sobrecarregar a event loop da API
+                            await asyncio.sleep(self.pdf_processing_delay_ms / 1000.0)
+                    finally:
+                        downloads.cancel()
 
                 except Exception as e:
                     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro ao processar chamada: {e}")
@@ -3,14 +3,169 @@ OpenAI Extractor Service - Extração de variáveis com LLM
 """
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-import json
+from collections import OrderedDict
+import hashlib
 import re
 import asyncio
+import orjson
 from openai import AsyncOpenAI
 
 from ...domain.repositories.edital_repository import EditalRepository
 
 
+# Campos numéricos do schema de extração (o LLM às vezes devolve "R$ 50.000,00" ou "12 meses")
+_NUMERIC_FIELDS = frozenset({
+    "duracao_min_meses",
+    "duracao_max_meses",
+    "valor_min_R$",
+    "valor_max_R$",
+    "contrapartida_min_%",
+    "contrapartida_max_%",
+})
+
+# Um número no formato brasileiro ("1.500.000,00", "20", "-3,5") e, logo em seguida, a unidade
+# por extenso que o multiplica ("R$ 2 milhões", "2 anos" em campo de meses). Unidades soltas
+# no resto do texto ("R$ 1.000.000,00 (um milhão de reais)") não contam
+_NUMBER_RE = re.compile(
+    r'(-?\d[\d.]*(?:,\d+)?)\s*(mil\b|milh(?:ão|ões|ao|oes)\b|bilh(?:ão|ões|ao|oes)\b|anos?\b)?',
+    re.IGNORECASE
+)
+# Multiplicadores casados por prefixo da unidade ("milh" antes de "mil")
+_UNIT_MULTIPLIERS = (("milh", 1_000_000), ("bilh", 1_000_000_000), ("mil", 1_000), ("ano", 12))
+
+# Segmentação do _chunk_text (compiladas uma vez): quebras múltiplas, títulos de seção
+# (CAPS ou numerados) e fim de sentença seguido de espaço (não quebra "1.000,00" nem URLs)
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+_SECTION_RE = re.compile(r'\n\n(?=[A-ZÇÃÕ\d][A-ZÇÃÕ\s\d\-:.]{5,}(?:\n|$))')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Limite de caracteres enviados por chunk (~3k tokens); protege contra chunks patológicos
+# (ex: OCR que concatena páginas sem pontuação e escapa da quebra por sentenças)
+_MAX_CHUNK_CHARS = 12_000
+
+# Campos preenchidos pelo sistema que o merge nunca sobrescreve
+_SYSTEM_KEYS = frozenset({"link", "uuid"})
+
+# Teto da resposta: o JSON com os 23 campos raramente passa de ~500 tokens;
+# o limite evita que uma resposta degenerada consuma tokens até o fim do contexto
+_MAX_COMPLETION_TOKENS = 800
+
+_EXTRACTION_MODEL = "gpt-4o-mini"
+
+# Cache em memória das extrações por chunk (reprocessar um edital inalterado não paga de novo).
+# Incrementar a versão ao mudar prompt, schema ou normalização invalida as entradas antigas.
+_EXTRACTION_CACHE_VERSION = "1"
+_EXTRACTION_CACHE_MAX_ENTRIES = 4096
+
+# Termos que indicam que o trecho pode conter algum campo extraível.
+# Chunks sem nenhum deles (cabeçalhos, rodapés, formulários) não vão para a OpenAI.
+_SIGNAL_RE = re.compile(
+    r'edital|chamada|financia|fomento|contrapartida|submiss|inscri|recurso|R\$|'
+    r'proponente|duraç|duracao|prazo|cronograma|bolsa|custeio|capital|resultado|'
+    r'\d{1,2}/\d{1,2}/\d{2,4}',
+    re.IGNORECASE
+)
+
+
+# Instruções e schema fixos ficam no system prompt: prefixo idêntico em todas as chamadas
+# permite que o prompt caching da OpenAI reaproveite o processamento entre chunks.
+_EXTRACTION_SYSTEM_PROMPT = """Você é um especialista em análise de editais de fomento à pesquisa e inovação no Brasil.
+Sua tarefa é extrair informações estruturadas de editais de agências como CNPq, FAPESQ, FINEP, CONFAP, CAPES, etc.
+
+INSTRUÇÕES IMPORTANTES:
+1. Leia TODO o texto cuidadosamente antes de extrair
+2. Se um campo não estiver explícito no texto, preencha com null (não com string vazia)
+3. Para datas, use o formato YYYY-MM-DD
+4. Para valores monetários, extraia apenas o número (sem R$, pontos ou vírgulas)
+5. Para percentuais, extraia apenas o número (sem % ou símbolos)
+6. Para durações, converta para MESES (ex: "12 meses", "1 ano" = 12 meses)
+7. Para booleanos, use true/false (não strings)
+
+CAMPOS A EXTRAIR:
+
+{
+  "apelido_edital": "Título/nome completo do edital (ex: 'Chamada Pública FAPESQ Nº 01/2025')",
+  "financiador_1": "Instituição principal que financia (ex: 'CNPq', 'FAPESQ-PB', 'FINEP', 'CONFAP', 'CAPES')",
+  "financiador_2": "Instituição secundária ou parceira (null se não houver)",
+  "area_foco": "Área(s) temática(s) do edital (ex: 'Saúde', 'Tecnologia', 'Mudanças Climáticas')",
+  "tipo_proponente": "Quem pode se candidatar (ex: 'Pesquisadores doutores', 'Instituições de Ensino', 'Empresas')",
+  "empresas_que_podem_submeter": "Tipos específicos de empresas elegíveis (ex: 'PMEs', 'Startups', 'Empresas brasileiras')",
+  "duracao_min_meses": "Duração mínima do projeto EM MESES (número inteiro ou null)",
+  "duracao_max_meses": "Duração máxima do projeto EM MESES (número inteiro ou null)",
+  "valor_min_R$": "Valor mínimo de financiamento em REAIS (número ou null)",
+  "valor_max_R$": "Valor máximo de financiamento em REAIS (número ou null)",
+  "tipo_recurso": "Tipo de recurso oferecido (ex: 'Bolsas', 'Financiamento não-reembolsável', 'Subvenção econômica')",
+  "recepcao_recursos": "Como os recursos serão recebidos (ex: 'Diretamente ao pesquisador', 'Via instituição')",
+  "custeio": "Permite gastos de custeio? (true/false/null)",
+  "capital": "Permite gastos de capital (equipamentos)? (true/false/null)",
+  "contrapartida_min_%": "Percentual mínimo de contrapartida exigida (número ou null)",
+  "contrapartida_max_%": "Percentual máximo de contrapartida exigida (número ou null)",
+  "tipo_contrapartida": "Tipo de contrapartida aceita (ex: 'Financeira', 'Econômica', 'Não há')",
+  "data_inicial_submissao": "Data de ABERTURA das submissões (YYYY-MM-DD ou null)",
+  "data_final_submissao": "Data de ENCERRAMENTO/PRAZO das submissões (YYYY-MM-DD ou null)",
+  "data_resultado": "Data prevista para divulgação dos RESULTADOS (YYYY-MM-DD ou null)",
+  "descricao_completa": "Resumo do objetivo/finalidade do edital em 1-2 frases",
+  "origem": "Agência de origem (extraia do texto: 'CNPq', 'FAPESQ', 'FINEP', 'CONFAP', 'CAPES', 'Governo da Paraíba', etc.)",
+  "observacoes": "Observações importantes, requisitos especiais ou restrições mencionadas"
+}
+
+IMPORTANTE:
+- Você receberá um trecho (chunk) do edital. Alguns campos podem estar em outros chunks.
+- Retorne APENAS o JSON válido, sem markdown, comentários ou texto adicional.
+- Use null para campos ausentes, NÃO use string vazia "" ou "null"."""
+
+# Partes fixas do payload montadas uma única vez (não alocar os mesmos dicts a cada chunk)
+_SYSTEM_MESSAGE = {"role": "system", "content": _EXTRACTION_SYSTEM_PROMPT}
+_RESPONSE_FORMAT = {"type": "json_object"}
+
+
+def _to_number(value: Any, months: bool = False) -> Optional[float]:
+    """
+    Converte um valor numérico retornado pelo LLM para int/float.
+
+    Aceita números e strings no formato brasileiro ("R$ 1.500.000,00", "20%", "24 meses",
+    "R$ 2 milhões", "2 anos"). Só a unidade colada ao número multiplica; valores por extenso
+    ao lado ("R$ 150.000,00 (cento e cinquenta mil reais)") são ignorados. Strings com mais
+    de um número ("de 12 a 24 meses") são ambíguas e viram None, preservando o valor já
+    salvo no merge.
+
+    Args:
+        value: Valor bruto extraído
+        months: Campo em meses (só então "ano(s)" é convertido; nos demais vira None)
+
+    Returns:
+        Optional[float]: Número (int quando inteiro) ou None se não for conversível
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+
+    matches = _NUMBER_RE.findall(str(value))
+    if len(matches) != 1:
+        return None
+
+    text, unit = matches[0]
+    text = text.rstrip('.')
+    if ',' in text:
+        # Formato brasileiro: ponto é milhar, vírgula é decimal
+        text = text.replace('.', '').replace(',', '.')
+    elif text.count('.') > 1 or (text.count('.') == 1 and len(text.rsplit('.', 1)[1]) == 3):
+        # "1.500.000" ou "50.000" -> separadores de milhar
+        text = text.replace('.', '')
+
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    if unit:
+        unit = unit.lower()
+        if unit.startswith("ano") and not months:
+            return None
+        number *= next(factor for prefix, factor in _UNIT_MULTIPLIERS if unit.startswith(prefix))
+    return int(number) if number.is_integer() else number
+
+
 class OpenAIExtractorService:
     """
     Serviço para extração de variáveis de editais usando OpenAI.
@@ -22,7 +177,9 @@ class OpenAIExtractorService:
         openai_api_key: str,
         edital_repository: EditalRepository,
         chromadb_service: Optional[Any] = None,
-        chunk_delay_ms: int = 500
+        chunk_delay_ms: int = 500,
+        openai_client: Optional[AsyncOpenAI] = None,
+        max_concurrent_chunks: int = 4
     ):
         """
         Inicializa o serviço.
@@ -32,11 +189,15 @@ class OpenAIExtractorService:
             edital_repository: Repositório de editais
             chromadb_service: Serviço ChromaDB (opcional)
             chunk_delay_ms: Delay em milissegundos entre chunks para não sobrecarregar a API
+            openai_client: Cliente OpenAI compartilhado (opcional; evita um pool HTTP por instância)
+            max_concurrent_chunks: Chunks enviados à OpenAI ao mesmo tempo (limite do processo inteiro)
         """
-        self.client = AsyncOpenAI(api_key=openai_api_key)
+        self.client = openai_client or AsyncOpenAI(api_key=openai_api_key)
         self.edital_repo = edital_repository
         self.chromadb_service = chromadb_service
         self.chunk_delay_ms = chunk_delay_ms
+        self.chunk_semaphore = asyncio.Semaphore(max_concurrent_chunks)
+        self._extraction_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
     def _chunk_text(self, text: str, chunk_size: int = 1500, overlap_sentences: int = 3) -> List[str]:
         """
@@ -57,16 +218,16 @@ class OpenAIExtractorService:
             List[str]: Lista de chunks semânticos
         """
         # 1. Normalizar quebras de linha
-        text = re.sub(r'\n{3,}', '\n\n', text)  # Múltiplas quebras -> dupla
+        text = _MULTI_NEWLINE_RE.sub('\n\n', text)  # Múltiplas quebras -> dupla
 
         # 2. Identificar blocos naturais (parágrafos ou seções)
         # Tenta detectar seções com títulos em CAPS ou numerados
-        section_pattern = r'\n\n(?=[A-ZÇÃÕ\d][A-ZÇÃÕ\s\d\-:.]{5,}(?:\n|$))'
-        sections = re.split(section_pattern, text)
+        sections = _SECTION_RE.split(text)
 
         chunks = []
-        current_chunk = ""
-        previous_sentences = []
+        # Partes do chunk atual; o texto só é montado ('\n\n'.join) quando o chunk fecha
+        buf: List[str] = []
+        buf_len = 0  # Tamanho de '\n\n'.join(buf)
 
         for section in sections:
             # Quebrar seção em parágrafos
@@ -78,24 +239,26 @@ class OpenAIExtractorService:
                     continue
 
                 # Se adicionar este parágrafo ultrapassa o limite
-                if len(current_chunk) + len(paragraph) > chunk_size and current_chunk:
+                if buf and buf_len + len(paragraph) > chunk_size:
                     # Salvar chunk atual
+                    current_chunk = '\n\n'.join(buf)
                     chunks.append(current_chunk.strip())
 
                     # Extrair últimas N sentenças para overlap
-                    sentences = re.split(r'(?<=[.!?])\s+', current_chunk)
+                    sentences = _SENTENCE_SPLIT_RE.split(current_chunk)
                     previous_sentences = sentences[-overlap_sentences:] if len(sentences) > overlap_sentences else sentences
 
                     # Iniciar novo chunk com overlap
-                    current_chunk = ' '.join(previous_sentences) + '\n\n' + paragraph
+                    overlap = ' '.join(previous_sentences)
+                    buf = [overlap, paragraph]
+                    buf_len = len(overlap) + 2 + len(paragraph)
                 else:
                     # Adicionar parágrafo ao chunk atual
-                    if current_chunk:
-                        current_chunk += '\n\n' + paragraph
-                    else:
-                        current_chunk = paragraph
+                    buf_len += len(paragraph) + (2 if buf else 0)
+                    buf.append(paragraph)
 
         # Adicionar último chunk
+        current_chunk = '\n\n'.join(buf)
         if current_chunk.strip():
             chunks.append(current_chunk.strip())
 
@@ -107,21 +270,61 @@ class OpenAIExtractorService:
                 final_chunks[-1] += '\n\n' + chunk
             # Se chunk muito grande (>3000 chars), forçar quebra por sentenças
             elif len(chunk) > 3000:
-                sentences = re.split(r'(?<=[.!?])\s+', chunk)
-                temp_chunk = ""
-                for sent in sentences:
-                    if len(temp_chunk) + len(sent) > chunk_size and temp_chunk:
-                        final_chunks.append(temp_chunk.strip())
-                        temp_chunk = sent
-                    else:
-                        temp_chunk += ' ' + sent if temp_chunk else sent
-                if temp_chunk.strip():
-                    final_chunks.append(temp_chunk.strip())
+                final_chunks.extend(self._split_oversized_chunk(chunk, chunk_size))
             else:
                 final_chunks.append(chunk)
 
         return final_chunks if final_chunks else [text]
 
+    def _split_oversized_chunk(self, chunk: str, chunk_size: int, overlap_chars: int = 200) -> List[str]:
+        """
+        Quebra um chunk grande demais em pedaços de até chunk_size, por sentenças.
+
+        Sentenças maiores que chunk_size (ex: OCR sem pontuação) viram janelas deslizantes
+        de tamanho fixo com overlap de caracteres, em vez de um único pedaço gigante
+        que seria truncado antes de ir para a OpenAI.
+
+        Args:
+            chunk: Texto do chunk
+            chunk_size: Tamanho máximo de cada pedaço (caracteres)
+            overlap_chars: Caracteres repetidos entre janelas de uma mesma sentença longa
+                (limitado à metade de chunk_size, para a janela sempre avançar)
+
+        Returns:
+            List[str]: Pedaços do chunk, na ordem original
+
+        Raises:
+            ValueError: Se chunk_size não for positivo
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size deve ser positivo (recebido {chunk_size})")
+        step = chunk_size - min(max(overlap_chars, 0), chunk_size // 2)
+
+        pieces = []
+        parts: List[str] = []
+        size = 0  # Tamanho de ' '.join(parts), sem concatenar a cada sentença
+
+        for sent in _SENTENCE_SPLIT_RE.split(chunk):
+            if len(sent) > chunk_size:
+                if parts:
+                    pieces.append(' '.join(parts))
+                    parts, size = [], 0
+                for start in range(0, len(sent), step):
+                    pieces.append(sent[start:start + chunk_size])
+                    if start + chunk_size >= len(sent):
+                        break
+            elif size + len(sent) > chunk_size and parts:
+                pieces.append(' '.join(parts))
+                parts, size = [sent], len(sent)
+            else:
+                size += len(sent) + (1 if parts else 0)
+                parts.append(sent)
+
+        if parts:
+            pieces.append(' '.join(parts))
+
+        return [piece.strip() for piece in pieces if piece.strip()]
+
     def _merge_variables(self, accumulated: Dict, new: Dict) -> Dict:
         """
         Merge inteligente de variáveis extraídas.
@@ -135,22 +338,21 @@ class OpenAIExtractorService:
             Dict: Dicionário merged
         """
         for key, value in new.items():
-            # Nunca sobrescrever link e uuid que vêm do sistema
-            if key in ["link", "uuid"]:
+            # Nunca sobrescrever link e uuid que vêm do sistema; ignora vazios
+            if value is None or value == "" or key in _SYSTEM_KEYS:
                 continue
 
-            if value is not None and value != "":
-                # Se o campo ainda não existe ou é nulo, adiciona
-                if accumulated.get(key) is None or accumulated.get(key) == "":
+            current = accumulated.get(key)
+            # Se o campo ainda não existe ou é nulo, adiciona
+            if current is None or current == "":
+                accumulated[key] = value
+            # Se ambos têm valor string, mantém o mais longo
+            elif isinstance(value, str) and isinstance(current, str):
+                if len(value) > len(current):
                     accumulated[key] = value
-                # Se ambos têm valor string, mantém o mais longo
-                elif isinstance(value, str) and isinstance(accumulated.get(key), str):
-                    if len(value) > len(accumulated[key]):
-                        accumulated[key] = value
-                # Para números, mantém o não-zero
-                elif isinstance(value, (int, float)) and value != 0:
-                    if accumulated.get(key) == 0 or accumulated.get(key) is None:
-                        accumulated[key] = value
+            # Para números, mantém o não-zero
+            elif isinstance(value, (int, float)) and value != 0 and current == 0:
+                accumulated[key] = value
 
         return accumulated
 
@@ -181,61 +383,65 @@ class OpenAIExtractorService:
 
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📊 Total de chunks: {len(chunks)}")
 
-        for i, chunk in enumerate(chunks, 1):
-            retry_count = 0
-            success = False
+        # Embeddings não dependem da extração: calculados enquanto a OpenAI extrai os chunks
+        embeddings_task = None
+        if self.chromadb_service:
+            embeddings_task = asyncio.create_task(self.chromadb_service.embed_texts(chunks))
 
-            while retry_count <= max_retries and not success:
-                try:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔄 Processando chunk {i}/{len(chunks)}")
+        try:
+            # Chunks são independentes: extrai em paralelo (limitado pelo semáforo) e faz o merge em ordem
+            results = await asyncio.gather(*(
+                self._process_chunk(chunk, i, len(chunks), edital_uuid, max_retries)
+                for i, chunk in enumerate(chunks, 1)
+            ))
+
+            for chunk_vars in results:
+                if chunk_vars is not None:
+                    accumulated_vars = self._merge_variables(accumulated_vars, chunk_vars)
 
-                    # Extrair variáveis do chunk
-                    chunk_vars = await self._extract_chunk(chunk, i, len(chunks))
+            # 🔍 VETORIZAR E SALVAR NO CHROMADB (um lote por edital)
+            if self.chromadb_service:
+                extracted = [
+                    (i, chunk, chunk_vars)
+                    for i, (chunk, chunk_vars) in enumerate(zip(chunks, results), 1)
+                    if chunk_vars is not None
+                ]
+                try:
+                    embeddings = await embeddings_task
+                except Exception as e:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Erro ao gerar embeddings antecipados, ChromaDB vai vetorizar: {e}")
+                    embeddings = None
 
-                    # ✅ SALVAR NO MONGODB A CADA CHUNK
-                    await self.edital_repo.save_partial_extraction(
-                        edital_uuid=edital_uuid,
-                        chunk_index=i,
-                        variables=chunk_vars,
-                        status="in_progress"
-                    )
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 💾 Chunk {i} salvo no MongoDB")
-
-                    # 🔍 VETORIZAR E SALVAR NO CHROMADB
-                    if self.chromadb_service:
-                        try:
-                            edital_name = chunk_vars.get('apelido_edital') or accumulated_vars.get('apelido_edital') or 'Edital CNPq'
-                            await self.chromadb_service.add_chunk(
-                                chunk_text=chunk,
-                                edital_uuid=edital_uuid,
-                                edital_name=edital_name,
-                                chunk_index=i,
-                                total_chunks=len(chunks),
-                                metadata={
+                try:
+                    if extracted:
+                        await self.chromadb_service.add_chunks(
+                            edital_uuid=edital_uuid,
+                            chunk_texts=[chunk for _, chunk, _ in extracted],
+                            edital_names=[
+                                chunk_vars.get('apelido_edital') or accumulated_vars.get('apelido_edital') or 'Edital CNPq'
+                                for _, _, chunk_vars in extracted
+                            ],
+                            chunk_indexes=[i for i, _, _ in extracted],
+                            total_chunks=len(chunks),
+                            metadatas=[
+                                {
                                     "financiador": chunk_vars.get('financiador_1') or chunk_vars.get('financiador_2'),
                                     "area_foco": chunk_vars.get('area_foco'),
                                     "link": pdf_url
                                 }
-                            )
-                        except Exception as e:
-                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Erro ao vetorizar chunk {i} no ChromaDB: {e}")
-
-                    # Merge com variáveis acumuladas
-                    accumulated_vars = self._merge_variables(accumulated_vars, chunk_vars)
-
-                    success = True
-
-                    # ⏱️ Delay entre chunks para não sobrecarregar a event loop da API
-                    await asyncio.sleep(self.chunk_delay_ms / 1000.0)
-
+                                for _, _, chunk_vars in extracted
+                            ],
+                            embeddings=[embeddings[i - 1] for i, _, _ in extracted] if embeddings else None
+                        )
                 except Exception as e:
-                    retry_count += 1
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro no chunk {i} (tentativa {retry_count}/{max_retries + 1}): {e}")
-
-                    if retry_count > max_retries:
-                        # Registrar erro mas continuar
-                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Pulando chunk {i} após {max_retries + 1} tentativas")
-                        break
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Erro ao vetorizar chunks no ChromaDB: {e}")
+        finally:
+            # Falha ou cancelamento no meio: não deixar embeddings órfãos consumindo a OpenAI
+            if embeddings_task is not None:
+                if not embeddings_task.done():
+                    embeddings_task.cancel()
+                elif not embeddings_task.cancelled():
+                    embeddings_task.exception()  # Marca a exceção como recuperada
 
         # ✅ GARANTIR QUE LINK E UUID ESTEJAM PRESENTES
         accumulated_vars["link"] = pdf_url
@@ -254,6 +460,55 @@ class OpenAIExtractorService:
 
         return accumulated_vars
 
+    async def _process_chunk(
+        self,
+        chunk: str,
+        chunk_index: int,
+        total_chunks: int,
+        edital_uuid: str,
+        max_retries: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extrai as variáveis de um chunk (com retry) e salva o resultado parcial no MongoDB.
+
+        Args:
+            chunk: Texto do chunk
+            chunk_index: Índice do chunk atual
+            total_chunks: Total de chunks
+            edital_uuid: UUID do edital
+            max_retries: Número máximo de tentativas em caso de erro
+
+        Returns:
+            Optional[Dict[str, Any]]: Variáveis extraídas ou None se todas as tentativas falharem
+        """
+        async with self.chunk_semaphore:
+            for attempt in range(max_retries + 1):
+                try:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔄 Processando chunk {chunk_index}/{total_chunks}")
+
+                    # Extrair variáveis do chunk
+                    chunk_vars = await self._extract_chunk(chunk, chunk_index, total_chunks)
+
+                    # ✅ SALVAR NO MONGODB A CADA CHUNK
+                    await self.edital_repo.save_partial_extraction(
+                        edital_uuid=edital_uuid,
+                        chunk_index=chunk_index,
+                        variables=chunk_vars,
+                        status="in_progress"
+                    )
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 💾 Chunk {chunk_index} salvo no MongoDB")
+
+                    # ⏱️ Delay antes de liberar a vaga para não sobrecarregar a event loop da API
+                    await asyncio.sleep(self.chunk_delay_ms / 1000.0)
+                    return chunk_vars
+
+                except Exception as e:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Erro no chunk {chunk_index} (tentativa {attempt + 1}/{max_retries + 1}): {e}")
+
+            # Registrar erro mas continuar
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Pulando chunk {chunk_index} após {max_retries + 1} tentativas")
+            return None
+
     async def _extract_chunk(self, chunk: str, chunk_index: int, total_chunks: int) -> Dict[str, Any]:
         """
         Extrai variáveis de um único chunk usando OpenAI.
@@ -266,51 +521,15 @@ class OpenAIExtractorService:
         Returns:
             Dict[str, Any]: Variáveis extraídas
         """
-        prompt = f"""
-Você é um especialista em análise de editais de fomento à pesquisa e inovação no Brasil.
-Sua tarefa é extrair informações estruturadas de editais de agências como CNPq, FAPESQ, FINEP, CONFAP, CAPES, etc.
-
-INSTRUÇÕES IMPORTANTES:
-1. Leia TODO o texto cuidadosamente antes de extrair
-2. Se um campo não estiver explícito no texto, preencha com null (não com string vazia)
-3. Para datas, use o formato YYYY-MM-DD
-4. Para valores monetários, extraia apenas o número (sem R$, pontos ou vírgulas)
-5. Para percentuais, extraia apenas o número (sem % ou símbolos)
-6. Para durações, converta para MESES (ex: "12 meses", "1 ano" = 12 meses)
-7. Para booleanos, use true/false (não strings)
+        if len(chunk) > _MAX_CHUNK_CHARS:
+            chunk = chunk[:_MAX_CHUNK_CHARS]
 
-CAMPOS A EXTRAIR:
+        # Pré-filtro local: trecho sem nenhum sinal de metadado não justifica chamada à API
+        if not _SIGNAL_RE.search(chunk):
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏭️ Chunk {chunk_index} sem informações extraíveis, pulando OpenAI")
+            return {}
 
-{{
-  "apelido_edital": "Título/nome completo do edital (ex: 'Chamada Pública FAPESQ Nº 01/2025')",
-  "financiador_1": "Instituição principal que financia (ex: 'CNPq', 'FAPESQ-PB', 'FINEP', 'CONFAP', 'CAPES')",
-  "financiador_2": "Instituição secundária ou parceira (null se não houver)",
-  "area_foco": "Área(s) temática(s) do edital (ex: 'Saúde', 'Tecnologia', 'Mudanças Climáticas')",
-  "tipo_proponente": "Quem pode se candidatar (ex: 'Pesquisadores doutores', 'Instituições de Ensino', 'Empresas')",
-  "empresas_que_podem_submeter": "Tipos específicos de empresas elegíveis (ex: 'PMEs', 'Startups', 'Empresas brasileiras')",
-  "duracao_min_meses": "Duração mínima do projeto EM MESES (número inteiro ou null)",
-  "duracao_max_meses": "Duração máxima do projeto EM MESES (número inteiro ou null)",
-  "valor_min_R$": "Valor mínimo de financiamento em REAIS (número ou null)",
-  "valor_max_R$": "Valor máximo de financiamento em REAIS (número ou null)",
-  "tipo_recurso": "Tipo de recurso oferecido (ex: 'Bolsas', 'Financiamento não-reembolsável', 'Subvenção econômica')",
-  "recepcao_recursos": "Como os recursos serão recebidos (ex: 'Diretamente ao pesquisador', 'Via instituição')",
-  "custeio": "Permite gastos de custeio? (true/false/null)",
-  "capital": "Permite gastos de capital (equipamentos)? (true/false/null)",
-  "contrapartida_min_%": "Percentual mínimo de contrapartida exigida (número ou null)",
-  "contrapartida_max_%": "Percentual máximo de contrapartida exigida (número ou null)",
-  "tipo_contrapartida": "Tipo de contrapartida aceita (ex: 'Financeira', 'Econômica', 'Não há')",
-  "data_inicial_submissao": "Data de ABERTURA das submissões (YYYY-MM-DD ou null)",
-  "data_final_submissao": "Data de ENCERRAMENTO/PRAZO das submissões (YYYY-MM-DD ou null)",
-  "data_resultado": "Data prevista para divulgação dos RESULTADOS (YYYY-MM-DD ou null)",
-  "descricao_completa": "Resumo do objetivo/finalidade do edital em 1-2 frases",
-  "origem": "Agência de origem (extraia do texto: 'CNPq', 'FAPESQ', 'FINEP', 'CONFAP', 'CAPES', 'Governo da Paraíba', etc.)",
-  "observacoes": "Observações importantes, requisitos especiais ou restrições mencionadas"
-}}
-
-IMPORTANTE:
-- Este é o chunk {chunk_index} de {total_chunks}. Alguns campos podem estar em outros chunks.
-- Retorne APENAS o JSON válido, sem markdown, comentários ou texto adicional.
-- Use null para campos ausentes, NÃO use string vazia "" ou "null".
+        user_prompt = f"""Este é o chunk {chunk_index} de {total_chunks}.
 
 Texto do edital:
 ---
@@ -319,32 +538,104 @@ Texto do edital:
 
 JSON extraído:"""
 
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0
+        # Chave só com versão do prompt, modelo e texto: o mesmo trecho em outra posição
+        # (ou num edital com outro total de chunks) reaproveita a extração
+        cache_key = hashlib.sha256(
+            f"{_EXTRACTION_CACHE_VERSION}\0{_EXTRACTION_MODEL}\0{chunk}".encode("utf-8")
+        ).hexdigest()
+        cached = self._extraction_cache.get(cache_key)
+        if cached is not None:
+            self._extraction_cache.move_to_end(cache_key)
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ♻️ Chunk {chunk_index} já extraído anteriormente, reaproveitando resposta")
+            return dict(cached)
+
+        stream = await self.client.chat.completions.create(
+            model=_EXTRACTION_MODEL,
+            messages=[
+                _SYSTEM_MESSAGE,
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0,
+            max_tokens=_MAX_COMPLETION_TOKENS,
+            # Modo JSON: o modelo emite só o objeto, sem prosa ou markdown ao redor
+            response_format=_RESPONSE_FORMAT,
+            stream=True
         )
 
-        resposta_llm = response.choices[0].message.content.strip()
-
-        # Limpar markdown code blocks
-        if "```json" in resposta_llm:
-            match = re.search(r'```json\s*(.*?)\s*```', resposta_llm, re.DOTALL)
-            if match:
-                resposta_llm = match.group(1).strip()
-        elif "```" in resposta_llm:
-            resposta_llm = resposta_llm.replace("```", "").strip()
+        # Lê o streaming só até o objeto JSON fechar (ignora markdown/prosa ao redor)
+        resposta_llm = await self._read_json_stream(stream)
 
         # Parse JSON
         try:
-            variables = json.loads(resposta_llm)
-
-            # Converter strings "null" em None
-            for key, value in variables.items():
-                if isinstance(value, str) and value.lower() == "null":
-                    variables[key] = None
+            # Uma passada: campos numéricos normalizados (merge pode comparar sem checar tipos)
+            # e strings "null" convertidas em None
+            variables = {
+                key: (
+                    _to_number(value, months=key.endswith("_meses")) if key in _NUMERIC_FIELDS
+                    else None if isinstance(value, str) and value.lower() == "null"
+                    else value
+                )
+                for key, value in orjson.loads(resposta_llm).items()
+            }
+
+            self._extraction_cache[cache_key] = dict(variables)
+            if len(self._extraction_cache) > _EXTRACTION_CACHE_MAX_ENTRIES:
+                self._extraction_cache.popitem(last=False)
 
             return variables
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ Resposta não é JSON válido: {e}")
             return {"erro": "resposta_invalida", "raw": resposta_llm[:500]}
+
+    async def _read_json_stream(self, stream) -> str:
+        """
+        Consome a resposta em streaming da OpenAI e devolve o primeiro objeto JSON completo.
+
+        Acompanha o balanço de chaves (ignorando chaves dentro de strings) e encerra o
+        streaming assim que o objeto raiz fecha, sem esperar o restante da resposta.
+        Texto fora do objeto (```json, prosa) é descartado.
+
+        Args:
+            stream: AsyncStream retornado por chat.completions.create(stream=True)
+
+        Returns:
+            str: Texto do objeto JSON (ou o que foi recebido, se ele não fechou)
+        """
+        parts: List[str] = []
+        depth = 0
+        in_string = False
+        escaped = False
+
+        async for event in stream:
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if not delta:
+                continue
+
+            start = 0
+            for i, ch in enumerate(delta):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"' and depth:
+                    in_string = True
+                elif ch == '{':
+                    if depth == 0:
+                        start = i
+                    depth += 1
+                elif ch == '}' and depth:
+                    depth -= 1
+                    if depth == 0:
+                        parts.append(delta[start:i + 1])
+                        await stream.close()
+                        return "".join(parts)
+
+            if depth:
+                parts.append(delta[start:])
+
+        return "".join(parts)
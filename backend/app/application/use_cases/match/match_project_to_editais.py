@@ -2,9 +2,11 @@
 Match Project to Editais Use Case
 Algoritmo de match usando ChromaDB + GPT-4o em múltiplas etapas
 """
-import json
+import heapq
 import time
-from typing import List, Dict, Any
+import orjson
+from operator import itemgetter
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from openai import AsyncOpenAI
 
@@ -12,6 +14,103 @@ from ....application.services.chromadb_service import ChromaDBService
 from ....domain.repositories.edital_repository import EditalRepository
 
 
+# Prompts estáticos: montados uma vez no import, só os campos variáveis são formatados por chamada
+_KEYWORDS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Você é um especialista em análise de projetos e editais. Retorne apenas JSON válido."
+}
+
+_KEYWORDS_PROMPT_TEMPLATE = """Você é um especialista em análise de projetos e editais de fomento.
+
+Com base nas informações do projeto abaixo, gere EXATAMENTE 3 frases-chave curtas e relevantes que serão usadas para busca em um banco vetorial (ChromaDB) de editais de fomento.
+
+INFORMAÇÕES DO PROJETO:
+- Título: {titulo_projeto}
+- Objetivo: {objetivo_principal}
+- Empresa: {nome_empresa}
+- Atividades: {resumo_atividades}
+- CNAE: {cnae}
+
+INSTRUÇÕES:
+1. Cada frase deve ter entre 5-15 palavras
+2. Foque em: área temática, público-alvo, tecnologias, impacto social
+3. Use termos técnicos relevantes para editais de fomento
+4. Evite repetição de palavras entre as frases
+5. Retorne APENAS um array JSON com as 3 frases
+
+FORMATO DE SAÍDA (JSON):
+["frase 1", "frase 2", "frase 3"]
+
+Exemplo:
+["plataforma educacional gamificada para ensino fundamental sobre meio ambiente", "tecnologia educacional EdTech para consciência ecológica infantil", "desenvolvimento software educativo biomas brasileiros sustentabilidade"]
+"""
+
+_ANALYSIS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Você é um especialista em análise de editais. Retorne apenas JSON válido."
+}
+
+_ANALYSIS_PROMPT_TEMPLATE = """Você é um especialista em análise de compatibilidade entre projetos e editais de fomento.
+
+PROJETO:
+- Título: {titulo_projeto}
+- Objetivo: {objetivo_principal}
+- Empresa: {nome_empresa}
+- Atividades: {resumo_atividades}
+- CNAE: {cnae}
+
+EDITAL:
+- Nome: {apelido_edital}
+- Financiador: {financiador}
+- Área de Foco: {area_foco}
+- Tipo de Proponente: {tipo_proponente}
+- Valor Mínimo: R$ {valor_min}
+- Valor Máximo: R$ {valor_max}
+
+TRECHOS RELEVANTES DO EDITAL:
+{context}
+
+TAREFA:
+Analise a compatibilidade entre o projeto e o edital. Retorne um JSON com:
+1. "match_score": número de 0 a 100 (compatibilidade)
+2. "reasoning": justificativa clara e objetiva (máx 200 caracteres)
+3. "compatibility_factors": objeto com fatores-chave de compatibilidade
+
+FORMATO DE SAÍDA (JSON):
+{{
+  "match_score": 85.5,
+  "reasoning": "Alta compatibilidade em educação, tecnologia e meio ambiente. Público-alvo alinhado.",
+  "compatibility_factors": {{
+    "area_match": "Educação e Tecnologia",
+    "target_audience": "Ensino Fundamental",
+    "theme_alignment": "Meio Ambiente",
+    "innovation_level": "Alto"
+  }}
+}}
+"""
+
+
+def _parse_gpt_json(content: str) -> Any:
+    """
+    Converte a resposta do GPT em JSON (orjson), removendo cercas de markdown se houver.
+
+    Args:
+        content: Conteúdo textual da resposta
+
+    Returns:
+        Any: Objeto JSON decodificado
+    """
+    content = content.strip()
+
+    # Extrair JSON do conteúdo (caso venha com markdown)
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+
+    return orjson.loads(content)
+
+
 class MatchProjectToEditaisUseCase:
     """
     Caso de uso para encontrar editais compatíveis com um projeto.
@@ -29,7 +128,8 @@ class MatchProjectToEditaisUseCase:
         self,
         chromadb_service: ChromaDBService,
         edital_repository: EditalRepository,
-        openai_api_key: str
+        openai_api_key: str,
+        openai_client: Optional[AsyncOpenAI] = None
     ):
         """
         Inicializa o caso de uso.
@@ -38,10 +138,11 @@ class MatchProjectToEditaisUseCase:
             chromadb_service: Serviço de busca vetorial
             edital_repository: Repositório de editais
             openai_api_key: Chave da API OpenAI
+            openai_client: Cliente OpenAI compartilhado (opcional; evita um pool HTTP por requisição)
         """
         self.chromadb = chromadb_service
         self.edital_repository = edital_repository
-        self.openai_client = AsyncOpenAI(api_key=openai_api_key)
+        self.openai_client = openai_client or AsyncOpenAI(api_key=openai_api_key)
 
     async def execute(
         self,
@@ -86,18 +187,15 @@ class MatchProjectToEditaisUseCase:
         keywords = await self._generate_search_keywords(project_info)
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔑 Palavras-chave geradas: {keywords}")
 
-        # ETAPA 3: Buscar chunks no ChromaDB para cada frase-chave
+        # ETAPA 3: Buscar chunks no ChromaDB para as frases-chave (um embedding e uma query em lote)
         all_chunks = []
-        for i, keyword in enumerate(keywords, 1):
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔍 Buscando com palavra-chave {i}/3: '{keyword}'")
-            
-            chunks = await self.chromadb.search_similar(
-                query=keyword,
-                n_results=10  # Top 10 chunks por palavra-chave
-            )
-            
+        results_per_keyword = await self.chromadb.search_similar_batch(
+            queries=keywords,
+            n_results=10  # Top 10 chunks por palavra-chave
+        )
+        for i, (keyword, chunks) in enumerate(zip(keywords, results_per_keyword), 1):
             all_chunks.extend(chunks)
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Encontrados {len(chunks)} chunks")
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Palavra-chave {i}/3 '{keyword}': {len(chunks)} chunks")
 
         # ETAPA 4: Agrupar chunks por edital e remover duplicatas
         editais_chunks = self._group_chunks_by_edital(all_chunks)
@@ -109,9 +207,8 @@ class MatchProjectToEditaisUseCase:
             editais_chunks=editais_chunks
         )
 
-        # ETAPA 6: Ordenar por score e retornar top 10
-        matches.sort(key=lambda x: x["match_score"], reverse=True)
-        top_matches = matches[:10]
+        # ETAPA 6: Ordenar por score e retornar top 10 (seleção parcial, sem ordenar a lista toda)
+        top_matches = heapq.nlargest(10, matches, key=itemgetter("match_score"))
 
         execution_time = time.time() - start_time
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Match concluído em {execution_time:.2f}s")
@@ -134,51 +231,20 @@ class MatchProjectToEditaisUseCase:
         Returns:
             Lista com 3 frases-chave
         """
-        prompt = f"""Você é um especialista em análise de projetos e editais de fomento.
-
-Com base nas informações do projeto abaixo, gere EXATAMENTE 3 frases-chave curtas e relevantes que serão usadas para busca em um banco vetorial (ChromaDB) de editais de fomento.
-
-INFORMAÇÕES DO PROJETO:
-- Título: {project_info['titulo_projeto']}
-- Objetivo: {project_info['objetivo_principal']}
-- Empresa: {project_info['nome_empresa']}
-- Atividades: {project_info['resumo_atividades']}
-- CNAE: {project_info['cnae']}
-
-INSTRUÇÕES:
-1. Cada frase deve ter entre 5-15 palavras
-2. Foque em: área temática, público-alvo, tecnologias, impacto social
-3. Use termos técnicos relevantes para editais de fomento
-4. Evite repetição de palavras entre as frases
-5. Retorne APENAS um array JSON com as 3 frases
-
-FORMATO DE SAÍDA (JSON):
-["frase 1", "frase 2", "frase 3"]
-
-Exemplo:
-["plataforma educacional gamificada para ensino fundamental sobre meio ambiente", "tecnologia educacional EdTech para consciência ecológica infantil", "desenvolvimento software educativo biomas brasileiros sustentabilidade"]
-"""
+        prompt = _KEYWORDS_PROMPT_TEMPLATE.format(**project_info)
 
         try:
             response = await self.openai_client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
-                    {"role": "system", "content": "Você é um especialista em análise de projetos e editais. Retorne apenas JSON válido."},
+                    _KEYWORDS_SYSTEM_MESSAGE,
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
                 max_tokens=300
             )
 
-            content = response.choices[0].message.content.strip()
-            
-            # Extrair JSON do conteúdo (caso venha com markdown)
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            keywords = json.loads(content)
+            keywords = _parse_gpt_json(response.choices[0].message.content)
             
             # Validar que retornou 3 frases
             if not isinstance(keywords, list) or len(keywords) != 3:
@@ -259,64 +325,28 @@ Exemplo:
                 context = self._build_context_for_analysis(chunks)
 
                 # Prompt para análise de compatibilidade
-                prompt = f"""Você é um especialista em análise de compatibilidade entre projetos e editais de fomento.
-
-PROJETO:
-- Título: {project_info['titulo_projeto']}
-- Objetivo: {project_info['objetivo_principal']}
-- Empresa: {project_info['nome_empresa']}
-- Atividades: {project_info['resumo_atividades']}
-- CNAE: {project_info['cnae']}
-
-EDITAL:
-- Nome: {edital.apelido_edital}
-- Financiador: {edital.financiador_1 or 'N/A'}
-- Área de Foco: {edital.area_foco or 'N/A'}
-- Tipo de Proponente: {edital.tipo_proponente or 'N/A'}
-- Valor Mínimo: R$ {edital.valor_min_R or 'N/A'}
-- Valor Máximo: R$ {edital.valor_max_R or 'N/A'}
-
-TRECHOS RELEVANTES DO EDITAL:
-{context}
-
-TAREFA:
-Analise a compatibilidade entre o projeto e o edital. Retorne um JSON com:
-1. "match_score": número de 0 a 100 (compatibilidade)
-2. "reasoning": justificativa clara e objetiva (máx 200 caracteres)
-3. "compatibility_factors": objeto com fatores-chave de compatibilidade
-
-FORMATO DE SAÍDA (JSON):
-{{
-  "match_score": 85.5,
-  "reasoning": "Alta compatibilidade em educação, tecnologia e meio ambiente. Público-alvo alinhado.",
-  "compatibility_factors": {{
-    "area_match": "Educação e Tecnologia",
-    "target_audience": "Ensino Fundamental",
-    "theme_alignment": "Meio Ambiente",
-    "innovation_level": "Alto"
-  }}
-}}
-"""
+                prompt = _ANALYSIS_PROMPT_TEMPLATE.format(
+                    **project_info,
+                    apelido_edital=edital.apelido_edital,
+                    financiador=edital.financiador_1 or 'N/A',
+                    area_foco=edital.area_foco or 'N/A',
+                    tipo_proponente=edital.tipo_proponente or 'N/A',
+                    valor_min=edital.valor_min_R or 'N/A',
+                    valor_max=edital.valor_max_R or 'N/A',
+                    context=context
+                )
 
                 response = await self.openai_client.chat.completions.create(
                     model="gpt-4o",
                     messages=[
-                        {"role": "system", "content": "Você é um especialista em análise de editais. Retorne apenas JSON válido."},
+                        _ANALYSIS_SYSTEM_MESSAGE,
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.3,
                     max_tokens=500
                 )
 
-                content = response.choices[0].message.content.strip()
-                
-                # Extrair JSON
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0].strip()
-                elif "```" in content:
-                    content = content.split("```")[1].split("```")[0].strip()
-                
-                analysis = json.loads(content)
+                analysis = _parse_gpt_json(response.choices[0].message.content)
 
                 # Montar resultado
                 match_result = {
@@ -360,10 +390,10 @@ FORMATO DE SAÍDA (JSON):
         context_parts = []
         current_length = 0
 
-        # Ordenar chunks por relevância (distance)
-        sorted_chunks = sorted(chunks, key=lambda x: x.get("distance", 999))
+        # Top 5 chunks por relevância (menor distance)
+        top_chunks = heapq.nsmallest(5, chunks, key=lambda x: x.get("distance", 999))
 
-        for i, chunk in enumerate(sorted_chunks[:5], 1):  # Top 5 chunks
+        for i, chunk in enumerate(top_chunks, 1):
             text = chunk.get("text", "")
             
             if current_length + len(text) > max_length:
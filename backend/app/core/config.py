@@ -31,6 +31,7 @@ class Settings(BaseSettings):
     CHROMA_HOST: str = os.getenv("CHROMA_HOST", "chroma")
     CHROMA_PORT: int = int(os.getenv("CHROMA_PORT", 8000))  # Porta interna do container
     CHROMA_COLLECTION: str = os.getenv("CHROMA_COLLECTION", "editais")
+    CHROMA_PERSIST_DIR: Optional[str] = os.getenv("CHROMA_PERSIST_DIR") or None  # Se definido, usa Chroma embutido (sem HTTP)
     
     # OpenAI
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
@@ -46,6 +47,7 @@ class Settings(BaseSettings):
     # Job Processing Performance
     JOB_MAX_WORKERS: int = int(os.getenv("JOB_MAX_WORKERS", 2))  # Número de workers para jobs pesados
     JOB_CHUNK_DELAY_MS: int = int(os.getenv("JOB_CHUNK_DELAY_MS", 500))  # Delay entre chunks (ms)
+    JOB_MAX_CONCURRENT_CHUNKS: int = int(os.getenv("JOB_MAX_CONCURRENT_CHUNKS", 4))  # Chunks extraídos em paralelo pela OpenAI
     JOB_PDF_PROCESSING_DELAY_MS: int = int(os.getenv("JOB_PDF_PROCESSING_DELAY_MS", 1000))  # Delay entre PDFs (ms)
 
     # Chat / RAG Settings
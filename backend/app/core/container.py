@@ -1,7 +1,9 @@
 """
 Dependency Injection Container - Gerencia todas as dependências da aplicação
 """
+import httpx
 from dependency_injector import containers, providers
+from openai import AsyncOpenAI
 
 # Infrastructure
 from ..infrastructure.persistence.mongodb.connection import MongoDBConnection
@@ -10,6 +12,7 @@ from ..infrastructure.persistence.mongodb.edital_repository_impl import MongoEdi
 from ..infrastructure.persistence.mongodb.project_repository_impl import MongoProjectRepository
 from ..infrastructure.persistence.mongodb.job_repository_impl import MongoJobRepository
 from ..infrastructure.persistence.mongodb.conversation_repository_impl import ConversationRepositoryImpl
+from ..infrastructure.persistence.mongodb.pdf_cache_repository_impl import MongoPdfCacheRepository
 from ..infrastructure.security.password_service import Argon2PasswordService
 from ..infrastructure.security.jwt_service import JWTService
 
@@ -98,6 +101,11 @@ class Container(containers.DeclarativeContainer):
         database=mongodb_connection.provided.db
     )
 
+    pdf_cache_repository = providers.Factory(
+        MongoPdfCacheRepository,
+        db_connection=mongodb_connection
+    )
+
     # Use Cases - User
     create_user_use_case = providers.Factory(
         CreateUserUseCase,
@@ -139,51 +147,76 @@ class Container(containers.DeclarativeContainer):
         project_repository=project_repository
     )
 
+    # OpenAI - cliente único por processo (reaproveita pool de conexões e TLS)
+    openai_http_client = providers.Singleton(
+        httpx.AsyncClient,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        timeout=httpx.Timeout(60.0, connect=5.0)
+    )
+
+    openai_client = providers.Singleton(
+        AsyncOpenAI,
+        api_key=settings.OPENAI_API_KEY,
+        http_client=openai_http_client,
+        max_retries=5  # Retry com backoff do SDK absorve 429/5xx transitórios
+    )
+
     # Application Services - ChromaDB
     chromadb_service = providers.Singleton(
         ChromaDBService,
         chroma_host=settings.CHROMA_HOST,
         chroma_port=settings.CHROMA_PORT,
-        openai_api_key=settings.OPENAI_API_KEY  # ⭐ Passar API key para embeddings da OpenAI
+        openai_api_key=settings.OPENAI_API_KEY,  # ⭐ Passar API key para embeddings da OpenAI
+        persist_dir=settings.CHROMA_PERSIST_DIR
     )
 
     # Application Services - Jobs
-    cnpq_scraper_service = providers.Factory(
+    # Scrapers são singletons: cliente HTTP persistente e pool de processos por processo da API
+    cnpq_scraper_service = providers.Singleton(
         CNPqScraperService,
-        max_workers=settings.JOB_MAX_WORKERS
+        max_workers=settings.JOB_MAX_WORKERS,
+        pdf_cache_repository=pdf_cache_repository
     )
 
-    fapesq_scraper_service = providers.Factory(
+    fapesq_scraper_service = providers.Singleton(
         FapesqScraperService,
-        max_workers=settings.JOB_MAX_WORKERS
+        max_workers=settings.JOB_MAX_WORKERS,
+        pdf_cache_repository=pdf_cache_repository
     )
 
-    paraiba_gov_scraper_service = providers.Factory(
+    paraiba_gov_scraper_service = providers.Singleton(
         ParaibaGovScraperService,
-        max_workers=settings.JOB_MAX_WORKERS
+        max_workers=settings.JOB_MAX_WORKERS,
+        pdf_cache_repository=pdf_cache_repository
     )
 
-    confap_scraper_service = providers.Factory(
+    confap_scraper_service = providers.Singleton(
         ConfapScraperService,
-        max_workers=settings.JOB_MAX_WORKERS
+        max_workers=settings.JOB_MAX_WORKERS,
+        pdf_cache_repository=pdf_cache_repository
     )
 
-    capes_scraper_service = providers.Factory(
+    capes_scraper_service = providers.Singleton(
         CapesScraperService,
-        max_workers=settings.JOB_MAX_WORKERS
+        max_workers=settings.JOB_MAX_WORKERS,
+        pdf_cache_repository=pdf_cache_repository
     )
 
-    finep_scraper_service = providers.Factory(
+    finep_scraper_service = providers.Singleton(
         FinepScraperService,
-        max_workers=settings.JOB_MAX_WORKERS
+        max_workers=settings.JOB_MAX_WORKERS,
+        pdf_cache_repository=pdf_cache_repository
     )
 
-    openai_extractor_service = providers.Factory(
+    # Sem estado por requisição: uma instância por processo (cliente OpenAI, caches futuros)
+    openai_extractor_service = providers.Singleton(
         OpenAIExtractorService,
         openai_api_key=config.OPENAI_API_KEY,
         edital_repository=edital_repository,
         chromadb_service=chromadb_service,
-        chunk_delay_ms=settings.JOB_CHUNK_DELAY_MS
+        chunk_delay_ms=settings.JOB_CHUNK_DELAY_MS,
+        openai_client=openai_client,
+        max_concurrent_chunks=settings.JOB_MAX_CONCURRENT_CHUNKS
     )
 
     job_scheduler_service = providers.Singleton(
@@ -210,7 +243,8 @@ class Container(containers.DeclarativeContainer):
         temperature=settings.CHAT_TEMPERATURE,
         top_k_chunks=settings.CHAT_TOP_K_CHUNKS,
         max_context_length=settings.CHAT_MAX_CONTEXT_LENGTH,
-        distance_threshold=settings.CHAT_DISTANCE_THRESHOLD
+        distance_threshold=settings.CHAT_DISTANCE_THRESHOLD,
+        openai_client=openai_client
     )
 
     # Use Cases - Match
@@ -218,5 +252,6 @@ class Container(containers.DeclarativeContainer):
         MatchProjectToEditaisUseCase,
         chromadb_service=chromadb_service,
         edital_repository=edital_repository,
-        openai_api_key=settings.OPENAI_API_KEY
+        openai_api_key=settings.OPENAI_API_KEY,
+        openai_client=openai_client
     )
@@ -0,0 +1,44 @@
+"""
+PDF Cache Repository Interface
+"""
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any
+
+
+class PdfCacheRepository(ABC):
+    """
+    Interface para o cache de PDFs baixados (validadores HTTP e texto extraído).
+    Permite GET condicional (ETag/Last-Modified) entre execuções e reinícios da API.
+    """
+
+    @abstractmethod
+    async def find_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca o registro de um PDF já baixado.
+
+        Args:
+            url: URL do PDF
+
+        Returns:
+            Optional[Dict[str, Any]]: {'etag', 'last_modified', 'texto'} ou None
+        """
+        pass
+
+    @abstractmethod
+    async def save(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        texto: str
+    ) -> None:
+        """
+        Grava (ou substitui) o registro de um PDF.
+
+        Args:
+            url: URL do PDF
+            etag: Header ETag da resposta
+            last_modified: Header Last-Modified da resposta
+            texto: Texto extraído do PDF
+        """
+        pass
@@ -0,0 +1,56 @@
+"""
+MongoDB PDF Cache Repository Implementation
+"""
+from typing import Optional, Dict, Any
+from datetime import datetime
+from ....domain.repositories.pdf_cache_repository import PdfCacheRepository
+from .connection import MongoDBConnection
+
+
+class MongoPdfCacheRepository(PdfCacheRepository):
+    """
+    Implementação concreta do PdfCacheRepository usando MongoDB.
+    A URL é o _id do documento (busca pelo índice padrão, sem índice extra).
+    """
+
+    def __init__(self, db_connection: MongoDBConnection):
+        """
+        Inicializa o repositório.
+
+        Args:
+            db_connection: Conexão com MongoDB
+        """
+        self.db_connection = db_connection
+        self.collection_name = "pdf_cache"
+
+    def _get_collection(self):
+        """Retorna a coleção do cache de PDFs"""
+        return self.db_connection.get_collection(self.collection_name)
+
+    async def find_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """Busca o registro de um PDF pela URL"""
+        collection = self._get_collection()
+        return await collection.find_one(
+            {"_id": url},
+            {"_id": 0, "etag": 1, "last_modified": 1, "texto": 1}
+        )
+
+    async def save(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        texto: str
+    ) -> None:
+        """Grava (upsert) o registro de um PDF"""
+        collection = self._get_collection()
+        await collection.update_one(
+            {"_id": url},
+            {"$set": {
+                "etag": etag,
+                "last_modified": last_modified,
+                "texto": texto,
+                "updated_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
@@ -4,7 +4,7 @@ Refatorado seguindo Clean Architecture
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pathlib import Path
 import uvicorn
 
@@ -48,6 +48,8 @@ Benefícios:
 - ✅ Independência de frameworks e databases
 """,
     version="2.0.0",
+    # Respostas serializadas com orjson (listagens grandes do ChromaDB, editais, chat)
+    default_response_class=ORJSONResponse,
 )
 
 # Configurar CORS
@@ -95,14 +97,23 @@ async def shutdown_event():
     scheduler.shutdown()
     print("✅ Job Scheduler encerrado")
 
-    # Encerrar executor de processos dos scrapers
-    cnpq_scraper = container.cnpq_scraper_service()
-    cnpq_scraper.shutdown()
-    print("✅ CNPq Scraper executor encerrado")
-
-    fapesq_scraper = container.fapesq_scraper_service()
-    fapesq_scraper.shutdown()
-    print("✅ FAPESQ Scraper executor encerrado")
+    # Encerrar clientes HTTP e executores de processos dos scrapers
+    scrapers = {
+        "CNPq": container.cnpq_scraper_service(),
+        "FAPESQ": container.fapesq_scraper_service(),
+        "Paraíba Gov": container.paraiba_gov_scraper_service(),
+        "CONFAP": container.confap_scraper_service(),
+        "CAPES": container.capes_scraper_service(),
+        "FINEP": container.finep_scraper_service(),
+    }
+    for nome, scraper in scrapers.items():
+        await scraper.aclose()
+        scraper.shutdown()
+        print(f"✅ {nome} Scraper encerrado")
+
+    # Encerrar cliente HTTP compartilhado da OpenAI
+    await container.openai_http_client().aclose()
+    print("✅ Cliente HTTP da OpenAI encerrado")
 
     # Desconectar MongoDB
     mongodb_conn = container.mongodb_connection()
@@ -19,20 +19,36 @@ def get_chromadb_service():
 
 @router.get("/chroma/documents", tags=["chroma"])
 async def get_chroma_documents(
+    skip: int = 0,
+    limit: int = 1000,
     chromadb: ChromaDBService = Depends(get_chromadb_service)
 ) -> Dict[str, Any]:
     """
-    Retorna todos os documentos armazenados no ChromaDB.
+    Retorna os documentos armazenados no ChromaDB.
     Endpoint para o visualizador (sem autenticação para facilitar uso).
+
+    - `skip` (opcional): Número de documentos a pular, usado junto com `limit` (padrão: 0)
+    - `limit` (opcional): Máximo de documentos por página (padrão: 1000)
+
+    Só a página pedida é lida do ChromaDB; `total` é sempre o total de
+    documentos da coleção.
     """
+    if skip < 0 or limit < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="skip deve ser >= 0 e limit >= 1"
+        )
+
     try:
-        result = await chromadb.get_all_documents()
+        result = await chromadb.get_documents_page(skip=skip, limit=limit)
         return {
             "status": "success",
             "documents": result.get('documents', []),
             "metadatas": result.get('metadatas', []),
             "ids": result.get('ids', []),
-            "total": result.get('total', 0)
+            "total": result.get('total', 0),
+            "skip": skip,
+            "limit": limit
         }
     except Exception as e:
         raise HTTPException(
@@ -97,7 +113,7 @@ async def list_editais(
     Retorna informações agregadas por edital.
     """
     try:
-        result = await chromadb.get_all_documents()
+        result = await chromadb.get_all_metadatas()
 
         # Agrupar por edital_uuid
         editais_map = {}
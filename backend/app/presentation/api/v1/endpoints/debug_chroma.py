@@ -3,6 +3,7 @@ Debug ChromaDB Endpoints - Para investigar problemas de busca
 """
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any
+from operator import itemgetter
 
 from app.application.services.chromadb_service import ChromaDBService
 
@@ -50,7 +51,7 @@ async def debug_chunks(
         return {
             "edital_uuid": edital_uuid,
             "total_chunks": len(chunks_info),
-            "chunks": sorted(chunks_info, key=lambda x: x["chunk_index"])
+            "chunks": sorted(chunks_info, key=itemgetter("chunk_index"))
         }
 
     except Exception as e:
@@ -0,0 +1,56 @@
+import pytest
+from ..application.services.openai_extractor_service import _to_number
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("R$ 50.000", 50000),
+    ("R$ 1.500.000,00", 1500000),
+    ("20%", 20),
+    ("3,5%", 3.5),
+    ("24 meses", 24),
+    ("R$ 2 milhões", 2000000),
+    ("R$ 1,5 milhão", 1500000),
+    ("R$ 300 mil", 300000),
+    (12, 12),
+])
+def test_to_number_converte_valores(value, expected):
+    """
+    Testa a conversão de valores numéricos no formato brasileiro
+    """
+    assert _to_number(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("R$ 1.000.000,00 (um milhão de reais)", 1000000),
+    ("R$ 150.000,00 (cento e cinquenta mil reais)", 150000),
+])
+def test_to_number_ignora_valor_por_extenso(value, expected):
+    """
+    Testa que unidades por extenso fora do número não multiplicam o valor
+    """
+    assert _to_number(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    "R$ 50.000 a R$ 100.000",
+    "de 12 a 24 meses",
+    "5% a 10%",
+    "até 36 meses (3 anos)",
+    "sem valor definido",
+    None,
+    True,
+])
+def test_to_number_ambiguo_ou_invalido(value):
+    """
+    Testa que valores ambíguos ou sem número viram None
+    """
+    assert _to_number(value) is None
+
+
+def test_to_number_anos_so_em_campos_de_meses():
+    """
+    Testa que anos viram meses só em campos de duração
+    """
+    assert _to_number("2 anos", months=True) == 24
+    assert _to_number("1 ano", months=True) == 12
+    assert _to_number("2 anos") is None